@@ -0,0 +1,5 @@
+"""Python clustering engine mirroring the Julia implementation in this directory."""
+
+from cluster.cluster_ward import hierarchical_time_clustering_ward
+from cluster.config import ClusteringConfig, ClusteringMethod, Dataset, ExtremePreservation
+from cluster.profile_type import ProfileType, get_profile_type
@@ -0,0 +1,454 @@
+"""
+Optimal contiguous K-partition by dynamic programming (band-limited).
+
+Python counterpart of cluster_dynamic_programming.jl. For a block [i, i+ℓ)
+and column j the representative value is
+
+    v̂ = max over the block   if j is Demand    and max ≥ τ_high[j]
+      = min over the block   if j is Renewable and min ≤ τ_low[j]
+      = block mean           otherwise
+
+and the block cost is Σ_j Σ_t (x_{t,j} - v̂_j)². Blocks are at most
+`max_block_size` (L) long.
+
+The segment-cost table is built one block length at a time: for every ℓ
+the block sums come from prefix-sum differences, and a running max/min array
+is extended by one row. All start positions and columns are handled together
+by NumPy, instead of scalar loops over start, length and column.
+
+Three solvers are available (`DPSolver`):
+
+- EXACT: the K-row banded DP of the Julia engine, O(K·n·L) time, with the
+  split table stored as one- or two-byte offsets.
+- CHECKPOINTED: EXACT keeping only every √K-th row, recomputing segments
+  while backtracking; identical partitions in O(√K·n) memory.
+- LAGRANGIAN: solves  min cost + λ·(#blocks)  with a single O(n·L) row and
+  bisects λ until the optimal block count equals K. A penalized optimum with
+  exactly K blocks is an optimal K-partition. If no λ yields exactly K (the
+  cost curve is not convex at K), it falls back to EXACT. Memory is linear
+  in n.
+
+`optimal_partitions_dp_sweep` keeps every row of one exact sweep, so the
+optimal partition of any K ≤ K_max can be cut out without rerunning.
+"""
+
+import enum
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from cluster.config import ClusteringConfig
+from cluster.profile_type import mode_masks
+from cluster.thresholds import compute_thresholds
+
+
+class DPSolver(enum.Enum):
+    EXACT = "exact"
+    CHECKPOINTED = "checkpointed"
+    LAGRANGIAN = "lagrangian"
+
+
+# =============================================================================
+# Segment cost  (band-limited)
+# =============================================================================
+
+def compute_segment_costs_banded(
+    values: np.ndarray,
+    is_demand: np.ndarray,
+    is_renewable: np.ndarray,
+    high_thresholds: np.ndarray,
+    low_thresholds: np.ndarray,
+    max_block_size: int,
+) -> np.ndarray:
+    """
+    (n, L) table where `result[i, ℓ - 1]` is the cost of the block starting at
+    row i with length ℓ; `inf` where the block would run past the end.
+    """
+    n, d = values.shape
+    L = min(max_block_size, n)
+
+    seg_cost = np.full((n, L), np.inf)
+
+    prefix_sum = np.zeros((n + 1, d))
+    prefix_sumsq = np.zeros((n + 1, d))
+    np.cumsum(values, axis=0, out=prefix_sum[1:])
+    np.cumsum(values ** 2, axis=0, out=prefix_sumsq[1:])
+
+    # running_max[i] / running_min[i] cover values[i : i + ℓ] after iteration ℓ
+    running_max = values.copy()
+    running_min = values.copy()
+
+    for length in range(1, L + 1):
+        m = n - length + 1
+        if length > 1:
+            np.maximum(running_max[:m], values[length - 1:], out=running_max[:m])
+            np.minimum(running_min[:m], values[length - 1:], out=running_min[:m])
+
+        s = prefix_sum[length:] - prefix_sum[:m]
+        ssq = prefix_sumsq[length:] - prefix_sumsq[:m]
+        seg_max = running_max[:m]
+        seg_min = running_min[:m]
+
+        v_hat = np.where(
+            is_demand & (seg_max >= high_thresholds),
+            seg_max,
+            np.where(is_renewable & (seg_min <= low_thresholds), seg_min, s / length),
+        )
+        seg_cost[:m, length - 1] = np.sum(ssq - 2.0 * v_hat * s + length * v_hat ** 2, axis=1)
+
+    return seg_cost
+
+
+def costs_by_end(seg_cost: np.ndarray) -> np.ndarray:
+    """Re-index the table by block end: `result[t, ℓ - 1]` = cost of the block [t - ℓ + 1, t]."""
+    n, L = seg_cost.shape
+    by_end = np.full((n, L), np.inf)
+    for length in range(1, L + 1):
+        by_end[length - 1:, length - 1] = seg_cost[:n - length + 1, length - 1]
+    return by_end
+
+
+# =============================================================================
+# Dynamic programming  (band-limited)
+# =============================================================================
+
+def _best_blocks(dp_prev: np.ndarray, by_end: np.ndarray):
+    """
+    One DP row: `dp[t] = min_ℓ dp_prev[t - ℓ] + cost(t - ℓ + 1, t)`.
+
+    Returns `(dp, lengths)`. Ties pick the longest block, i.e. the earliest
+    split, as in the Julia loop.
+    """
+    n, L = by_end.shape
+    padded = np.concatenate([np.full(L, np.inf), dp_prev])
+    # candidates[t, i] uses block length ℓ = L - i
+    candidates = sliding_window_view(padded, L)[:n] + by_end[:, ::-1]
+    best = np.argmin(candidates, axis=1)
+    return candidates[np.arange(n), best], L - best
+
+
+def _offset_dtype(L: int):
+    """Smallest unsigned type holding a split offset `t - s` in [0, L - 1]."""
+    return np.uint8 if L <= 256 else np.uint16
+
+
+def _check_feasible(n: int, L: int, K: int) -> None:
+    if not 1 <= K <= n:
+        raise ValueError(f"n_prime ({K}) must lie in [1, {n}]")
+    if n > K * L:
+        raise ValueError(f"Infeasible: {n} timesteps cannot be covered by {K} blocks of max length {L}")
+
+
+def optimal_partition_dp_banded(seg_cost: np.ndarray, K: int, checkpointed: bool = False) -> np.ndarray:
+    """
+    Block lengths of the optimal K-partition.
+
+    Each of the K DP rows is computed for all end positions at once. The
+    split of row k at t always lies within L of t, so back-pointers are kept
+    as uint8/uint16 offsets `t - s` instead of absolute start indices.
+
+    With `checkpointed`, only every ceil(√K)-th cost row is kept during the
+    forward pass. Backtracking recomputes one segment of rows at a time from
+    its checkpoint, so about √K rows of costs and of offsets are in memory at
+    once, at the price of a second forward pass.
+
+    Complexity: O(K·n·L) time; O(K·n) bytes of offsets, or O(√K·n) checkpointed.
+    """
+    n, L = seg_cost.shape
+    _check_feasible(n, L, K)
+
+    by_end = costs_by_end(seg_cost)
+    offset_dtype = _offset_dtype(L)
+
+    dp = np.full(n, np.inf)
+    dp[:L] = seg_cost[0, :L]
+
+    def forward(dp, rows):
+        """Advance `rows` DP rows from `dp`; returns the last row and their offsets."""
+        offsets = np.empty((rows, n), dtype=offset_dtype)
+        for r in range(rows):
+            dp, lengths = _best_blocks(dp, by_end)
+            offsets[r] = lengths - 1
+        return dp, offsets
+
+    # segments[i] = (first row k of the segment, cost row k - 1 it starts from)
+    if checkpointed:
+        step = int(np.ceil(np.sqrt(K)))
+        segments = []
+        for k in range(1, K, step):
+            segments.append((k, dp))
+            dp, _ = forward(dp, min(step, K - k))
+    else:
+        _, offsets = forward(dp, K - 1)
+        segments = [(1, offsets)]
+
+    # ── Backtrack ─────────────────────────────────────────────────────────────
+    lengths = []
+    t = n - 1
+    for i in range(len(segments) - 1, -1, -1):
+        first, stored = segments[i]
+        last = segments[i + 1][0] if i + 1 < len(segments) else K
+        offsets = forward(stored, last - first)[1] if checkpointed else stored
+        t = _backtrack_rows(offsets, first, last, t, lengths)
+    lengths.append(t + 1)
+
+    return np.array(lengths[::-1], dtype=np.int64)
+
+
+def _backtrack_rows(offsets: np.ndarray, first: int, last: int, t: int, lengths: list) -> int:
+    """
+    Follow rows `last - 1` down to `first` (stored from `offsets[0]`) starting
+    at end position t, appending block lengths; returns the new end position.
+    """
+    for k in range(last - 1, first - 1, -1):
+        length = int(offsets[k - first, t]) + 1
+        lengths.append(length)
+        t -= length
+    return t
+
+
+# =============================================================================
+# All K up to K_max from one sweep
+# =============================================================================
+
+@dataclass
+class DPSweep:
+    """
+    Optimal partitions for every K ≤ K_max from a single banded DP sweep.
+
+    Row k of the DP (k + 1 blocks) does not depend on the final K, so the
+    back-pointers of one sweep up to K_max backtrack to the optimal partition
+    of any smaller K. `costs[k - 1]` is the optimal objective with k blocks
+    (`inf` where k blocks of length ≤ L cannot cover the series), which gives
+    the optimal error-vs-K curve as a by-product.
+    """
+    offsets: np.ndarray         # uint8/uint16 (K_max - 1, n), row i holds k = i + 1
+    costs: np.ndarray           # float64 (K_max,)
+    values: np.ndarray          # float64 (n, d)
+    is_demand: np.ndarray
+    is_renewable: np.ndarray
+    high_thresholds: np.ndarray
+    low_thresholds: np.ndarray
+
+    @property
+    def k_max(self) -> int:
+        return len(self.costs)
+
+    def partition(self, K: int) -> np.ndarray:
+        """Block lengths of the optimal K-partition."""
+        if not 1 <= K <= self.k_max or not np.isfinite(self.costs[K - 1]):
+            raise ValueError(f"No feasible {K}-partition in this sweep (K_max = {self.k_max})")
+        lengths = []
+        t = _backtrack_rows(self.offsets, 1, K, self.values.shape[0] - 1, lengths)
+        lengths.append(t + 1)
+        return np.array(lengths[::-1], dtype=np.int64)
+
+    def cut(self, K: int):
+        """`(partitions, result_values, mean_values)` of the optimal K-partition."""
+        partitions = self.partition(K)
+        result_values, mean_values = collect_rep_and_mean_values(
+            self.values, partitions, self.is_demand, self.is_renewable,
+            self.high_thresholds, self.low_thresholds,
+        )
+        return partitions, result_values, mean_values
+
+
+def optimal_partitions_dp_sweep(
+    values,
+    modes,
+    k_max: int,
+    config: ClusteringConfig = ClusteringConfig(),
+    thresholds=None,
+) -> DPSweep:
+    """
+    Run the banded DP once up to `k_max` blocks and keep every row's
+    back-pointers and optimal cost. `config.n_prime` is ignored.
+
+    Complexity: O(K_max·n·L) time, O(K_max·n) bytes of offsets.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    n, d = values.shape
+    if len(modes) != d:
+        raise ValueError("Length of modes must match number of columns")
+    if not 1 <= k_max <= n:
+        raise ValueError(f"k_max ({k_max}) must lie in [1, {n}]")
+
+    if thresholds is None:
+        thresholds = compute_thresholds(values, config.high_percentile, config.low_percentile)
+    high_thresholds, low_thresholds = thresholds
+    is_demand, is_renewable = mode_masks(modes)
+
+    seg_cost = compute_segment_costs_banded(
+        values, is_demand, is_renewable, high_thresholds, low_thresholds, config.max_block_size
+    )
+    L = seg_cost.shape[1]
+    by_end = costs_by_end(seg_cost)
+
+    offsets = np.empty((k_max - 1, n), dtype=_offset_dtype(L))
+    costs = np.empty(k_max)
+
+    dp = np.full(n, np.inf)
+    dp[:L] = seg_cost[0, :L]
+    costs[0] = dp[-1]
+    for k in range(1, k_max):
+        dp, lengths = _best_blocks(dp, by_end)
+        offsets[k - 1] = lengths - 1
+        costs[k] = dp[-1]
+
+    return DPSweep(
+        offsets=offsets,
+        costs=costs,
+        values=values,
+        is_demand=is_demand,
+        is_renewable=is_renewable,
+        high_thresholds=high_thresholds,
+        low_thresholds=low_thresholds,
+    )
+
+
+# =============================================================================
+# Penalized (Lagrangian) dynamic programming
+# =============================================================================
+
+def _penalized_partition(by_start: np.ndarray, lam: float):
+    """
+    Optimal partition of  cost + lam·(#blocks)  with no limit on the count.
+
+    `by_start[t, L - ℓ]` is the cost of the block of length ℓ ending at t, so
+    the candidates for t line up with the prefix costs they extend. Among
+    equally cheap candidates the one with fewer blocks wins, so the block
+    count is non-increasing in `lam`. Returns `(block_count, lengths)`.
+    """
+    n, L = by_start.shape
+    best = np.empty(n + 1)
+    best[0] = 0.0
+    counts = np.zeros(n + 1, dtype=np.int64)
+    back = np.empty(n, dtype=np.int64)
+
+    for t in range(n):
+        m = min(L, t + 1)
+        lo = t + 1 - m
+        # candidate i continues the prefix ending before row lo + i
+        candidates = best[lo:t + 1] + by_start[t, L - m:]
+        ties = np.flatnonzero(candidates == candidates.min())
+        i = ties[0] if len(ties) == 1 else ties[np.argmin(counts[lo + ties])]
+        best[t + 1] = candidates[i] + lam
+        counts[t + 1] = counts[lo + i] + 1
+        back[t] = m - i
+
+    lengths = []
+    t = n - 1
+    while t >= 0:
+        lengths.append(back[t])
+        t -= back[t]
+    return int(counts[n]), np.array(lengths[::-1], dtype=np.int64)
+
+
+def optimal_partition_dp_penalized(seg_cost: np.ndarray, K: int, max_iter: int = 100) -> np.ndarray:
+    """
+    Block lengths of the optimal K-partition via bisection on the block
+    penalty λ. Falls back to `optimal_partition_dp_banded` when no λ gives
+    exactly K blocks.
+
+    Complexity: O(n·L) time per λ, O(n) space.
+    """
+    n, L = seg_cost.shape
+    _check_feasible(n, L, K)
+
+    by_start = np.ascontiguousarray(costs_by_end(seg_cost)[:, ::-1])
+
+    # Merging two blocks never costs more than the largest block cost, so
+    # above that penalty the fewest feasible blocks are optimal.
+    lo, hi = 0.0, float(np.max(seg_cost[np.isfinite(seg_cost)])) + 1.0
+
+    for _ in range(max_iter):
+        lam = 0.5 * (lo + hi)
+        count, lengths = _penalized_partition(by_start, lam)
+        if count == K:
+            return lengths
+        if count > K:
+            lo = lam
+        else:
+            hi = lam
+        if hi - lo <= 1e-10 * hi:
+            break
+
+    return optimal_partition_dp_banded(seg_cost, K)
+
+
+# =============================================================================
+# Representative and mean values from a partition
+# =============================================================================
+
+def collect_rep_and_mean_values(
+    values: np.ndarray,
+    partitions: np.ndarray,
+    is_demand: np.ndarray,
+    is_renewable: np.ndarray,
+    high_thresholds: np.ndarray,
+    low_thresholds: np.ndarray,
+):
+    """`(result_values, mean_values)`, each (K × d), for the blocks of `partitions`."""
+    starts = np.concatenate([[0], np.cumsum(partitions)[:-1]])
+    mean_values = np.add.reduceat(values, starts, axis=0) / np.asarray(partitions)[:, None]
+    block_max = np.maximum.reduceat(values, starts, axis=0)
+    block_min = np.minimum.reduceat(values, starts, axis=0)
+
+    result_values = np.where(
+        is_demand & (block_max >= high_thresholds),
+        block_max,
+        np.where(is_renewable & (block_min <= low_thresholds), block_min, mean_values),
+    )
+    return result_values, mean_values
+
+
+# =============================================================================
+# Public entry point
+# =============================================================================
+
+def optimal_time_partitioning_dp(
+    values,
+    modes,
+    config: ClusteringConfig = ClusteringConfig(),
+    thresholds=None,
+    solver: DPSolver = DPSolver.EXACT,
+):
+    """
+    Drop-in replacement for `hierarchical_time_clustering_ward`: the globally
+    optimal K-partition (K = config.n_prime) under the extreme-aware SSE
+    objective, with blocks of at most `config.max_block_size` timesteps.
+
+    Returns `(partitions, result_values, mean_values, ward_errors, ldc_errors)`;
+    the error curves are always empty. `solver` selects the exact K-row DP,
+    its checkpointed variant or the linear-memory Lagrangian search.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    n, d = values.shape
+    if len(modes) != d:
+        raise ValueError("Length of modes must match number of columns")
+
+    if thresholds is None:
+        thresholds = compute_thresholds(values, config.high_percentile, config.low_percentile)
+    high_thresholds, low_thresholds = thresholds
+    is_demand, is_renewable = mode_masks(modes)
+
+    seg_cost = compute_segment_costs_banded(
+        values, is_demand, is_renewable, high_thresholds, low_thresholds, config.max_block_size
+    )
+    if solver == DPSolver.LAGRANGIAN:
+        partitions = optimal_partition_dp_penalized(seg_cost, config.n_prime)
+    else:
+        partitions = optimal_partition_dp_banded(
+            seg_cost, config.n_prime, checkpointed=solver == DPSolver.CHECKPOINTED
+        )
+
+    result_values, mean_values = collect_rep_and_mean_values(
+        values, partitions, is_demand, is_renewable, high_thresholds, low_thresholds
+    )
+
+    return partitions, result_values, mean_values, np.empty((0, d)), np.empty((0, d))
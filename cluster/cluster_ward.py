@@ -0,0 +1,207 @@
+"""
+Array-backed Ward clustering of contiguous time blocks.
+
+Python counterpart of `hierarchical_time_clustering_ward` in cluster_ward.jl.
+Instead of one `LinkedListNode` per timestep, the doubly linked list of
+active clusters lives in flat NumPy arrays indexed by the cluster's first
+(left-most) timestep:
+
+    prev, next      int32 (n,)     neighbour indices, -1 at the ends
+    sums/mins/maxs  float64 (n, d) per-cluster aggregates
+    counts          int64 (n,)     number of timesteps in the cluster
+    is_extreme      uint64 (n, W)  OR of the members' extreme flags, bit-packed
+
+Merging cluster `b` into its left neighbour `a` only touches row `a`, so a
+cluster is always addressed by its start index and no per-timestep Python
+objects are ever created.
+"""
+
+import numpy as np
+
+from cluster.cluster_dynamic_programming import optimal_time_partitioning_dp
+from cluster.config import (
+    CONFLICT_AWARE,
+    ClusteringConfig,
+    ExtremePreservation,
+    should_update_extremes_after_clustering,
+)
+from cluster.extremes import get_is_extreme, pack_extremes, popcount
+from cluster.indexed_heap import IndexedMinHeap
+from cluster.merge_log import MergeLog
+from cluster.merge_stats import merge_errors
+from cluster.profile_type import mode_masks
+from cluster.thresholds import compute_thresholds
+
+
+class ClusterArrays:
+    """Contiguous-cluster linked list stored as NumPy arrays."""
+
+    __slots__ = ("prev", "next", "sums", "mins", "maxs", "counts", "is_extreme", "active")
+
+    def __init__(self, values: np.ndarray, is_extreme: np.ndarray):
+        n = values.shape[0]
+        self.prev = np.arange(-1, n - 1, dtype=np.int32)
+        self.next = np.arange(1, n + 1, dtype=np.int32)
+        self.next[-1] = -1
+        self.sums = values.copy()
+        self.mins = values.copy()
+        self.maxs = values.copy()
+        self.counts = np.ones(n, dtype=np.int64)
+        self.is_extreme = pack_extremes(is_extreme)
+        self.active = np.ones(n, dtype=bool)
+
+    def centroid(self, a: int) -> np.ndarray:
+        return self.sums[a] / self.counts[a]
+
+    def ward(self, a: int, b: int) -> float:
+        """Increase in SSE caused by merging clusters `a` and `b`."""
+        ca = self.counts[a]
+        cb = self.counts[b]
+        diff = self.sums[a] / ca - self.sums[b] / cb
+        return float(ca * cb / (ca + cb) * np.dot(diff, diff))
+
+    def conflict(self, a: int, b: int) -> int:
+        """Number of columns in which `a` and `b` disagree on being extreme."""
+        return popcount(self.is_extreme[a] ^ self.is_extreme[b])
+
+    def merge(self, a: int, b: int) -> None:
+        """Merge cluster `b` into its left neighbour `a`."""
+        self.sums[a] += self.sums[b]
+        np.minimum(self.mins[a], self.mins[b], out=self.mins[a])
+        np.maximum(self.maxs[a], self.maxs[b], out=self.maxs[a])
+        self.counts[a] += self.counts[b]
+        self.is_extreme[a] |= self.is_extreme[b]
+
+        nxt = self.next[b]
+        self.next[a] = nxt
+        if nxt != -1:
+            self.prev[nxt] = a
+
+        self.active[b] = False
+        self.prev[b] = -1
+        self.next[b] = -1
+
+    def active_indices(self) -> np.ndarray:
+        """Start indices of the active clusters, in time order."""
+        return np.flatnonzero(self.active)
+
+
+# =========================
+# Merge loop
+# =========================
+
+def _run_merges(values, modes, config: ClusteringConfig, n_target: int, thresholds=None):
+    """Merge down to `n_target` clusters and return the merge log."""
+    if config.extreme_preservation == ExtremePreservation.DYNAMIC_PROGRAMMING:
+        raise ValueError("DynamicProgramming has no merge sequence; use optimal_time_partitioning_dp")
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    n, d = values.shape
+    if len(modes) != d:
+        raise ValueError("Length of modes must match number of columns")
+
+    if thresholds is None:
+        thresholds = compute_thresholds(values, config.high_percentile, config.low_percentile)
+    high_thresholds, low_thresholds = thresholds
+    is_demand, is_renewable = mode_masks(modes)
+    is_extreme = get_is_extreme(values, is_demand, is_renewable, high_thresholds, low_thresholds, config)
+
+    clusters = ClusterArrays(values, is_extreme)
+    conflict_aware = config.extreme_preservation in CONFLICT_AWARE
+
+    # -------------------------
+    # Heap of candidate merges
+    # -------------------------
+    # One entry per adjacency (a, next[a]), keyed by the left cluster `a`.
+
+    def priority(a, b):
+        conflict = clusters.conflict(a, b) if conflict_aware else 0
+        return conflict, clusters.ward(a, b)
+
+    heap = IndexedMinHeap.heapify(n, ((i, *priority(i, i + 1)) for i in range(n - 1)))
+
+    total_merges = max(n - n_target, 0)
+    left = np.empty(total_merges, dtype=np.int32)
+    right = np.empty(total_merges, dtype=np.int32)
+    conflicts = np.empty(total_merges, dtype=np.int32)
+    wards = np.empty(total_merges, dtype=np.float64)
+
+    for step in range(total_merges):
+        conflict, ward = heap.key(heap.peek())
+        a = heap.pop()
+        b = int(clusters.next[a])
+        clusters.merge(a, b)
+        left[step], right[step], conflicts[step], wards[step] = a, b, conflict, ward
+
+        # b's adjacency now belongs to a; both neighbours of a changed priority.
+        heap.delete(b)
+        prev = int(clusters.prev[a])
+        if prev != -1:
+            heap.update(prev, *priority(prev, a))
+        nxt = int(clusters.next[a])
+        if nxt != -1:
+            heap.update(a, *priority(a, nxt))
+
+    return MergeLog(
+        left=left,
+        right=right,
+        conflict=conflicts,
+        ward=wards,
+        values=values,
+        is_extreme=is_extreme,
+        is_demand=is_demand,
+        is_renewable=is_renewable,
+        update_extremes=should_update_extremes_after_clustering(config.extreme_preservation),
+    )
+
+
+# =========================
+# Public entry points
+# =========================
+
+def ward_merge_log(
+    values,
+    modes,
+    config: ClusteringConfig = ClusteringConfig(),
+    min_clusters: int = 1,
+    thresholds=None,
+) -> MergeLog:
+    """
+    Run the agglomeration once down to `min_clusters` and return its merge log.
+
+    `config.n_prime` is ignored; use `MergeLog.cut(k)` for every k of a sweep.
+    """
+    return _run_merges(values, modes, config, min_clusters, thresholds)
+
+
+def hierarchical_time_clustering_ward(
+    values,
+    modes,
+    config: ClusteringConfig = ClusteringConfig(),
+    thresholds=None,
+):
+    """
+    Cluster the rows of `values` (n × d) into `config.n_prime` contiguous blocks.
+
+    Returns `(partitions, result_values, mean_values, ward_errors, ldc_errors)`
+    like the Julia engine: block lengths, (k × d) representative and mean
+    values, and — with `config.calc_stats` — (merges × d) SSE and LDC RMSE
+    recorded before every merge.
+
+    `thresholds` optionally passes precomputed `(high, low)` column thresholds,
+    e.g. from a `ThresholdCache`.
+    """
+    if config.extreme_preservation == ExtremePreservation.DYNAMIC_PROGRAMMING:
+        return optimal_time_partitioning_dp(values, modes, config, thresholds)
+
+    log = _run_merges(values, modes, config, config.n_prime, thresholds)
+    partitions, result_values, mean_values = log.cut(log.min_clusters)
+
+    if config.calc_stats:
+        ward_errors, ldc_errors = merge_errors(log)
+    else:
+        ward_errors = ldc_errors = np.empty((0, log.values.shape[1]))
+
+    return partitions, result_values, mean_values, ward_errors, ldc_errors
@@ -0,0 +1,103 @@
+"""
+Common highest resolution of partitions, computed on boundary bitmaps.
+
+Python counterpart of `common_highest_resolution` in common_resolution.jl.
+A partition of T timesteps is represented by the bitmap of its block
+starts: bit t is set when a block begins at timestep t (bit 0 is always
+set). The common highest resolution of several partitions has exactly the
+union of their block starts, so it is the bitwise OR of their bitmaps.
+
+Bitmaps are packed little-endian into uint64 words, one row per partition:
+
+    bitmaps  uint64 (m, ceil(T / 64))
+
+Converting m partitions in and out is a handful of whole-array operations,
+and the OR over thousands of flows (`pairwise_common_resolution`) or over
+every asset of a location (`grouped_common_resolution`) is one vectorized
+call.
+"""
+
+import numpy as np
+
+
+def _n_words(n_steps: int) -> int:
+    return (n_steps + 63) // 64
+
+
+def csr_to_bitmaps(flat: np.ndarray, offsets: np.ndarray, n_steps: int) -> np.ndarray:
+    """Pack block sizes in CSR layout; row i is `flat[offsets[i]:offsets[i + 1]]`."""
+    flat = np.asarray(flat, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    m = len(offsets) - 1
+
+    # Block starts = running sum within each row, excluding the block itself.
+    cum = np.concatenate([[0], np.cumsum(flat)])
+    before = cum[offsets[:-1]]
+    if np.any(cum[offsets[1:]] - before != n_steps):
+        raise ValueError(f"Every partition must sum to n_steps ({n_steps})")
+    starts = cum[offsets[0]:offsets[-1]] - np.repeat(before, np.diff(offsets))
+
+    bits = np.zeros((m, _n_words(n_steps) * 64), dtype=bool)
+    bits[np.repeat(np.arange(m), np.diff(offsets)), starts] = True
+    return np.packbits(bits, axis=1, bitorder="little").view(np.uint64)
+
+
+def partitions_to_bitmaps(partitions, n_steps: int) -> np.ndarray:
+    """Pack a sequence of block-size vectors, each summing to `n_steps`."""
+    offsets = np.concatenate([[0], np.cumsum([len(p) for p in partitions], dtype=np.int64)])
+    flat = np.concatenate([np.asarray(p, dtype=np.int64) for p in partitions] + [np.empty(0, np.int64)])
+    return csr_to_bitmaps(flat, offsets, n_steps)
+
+
+def bitmaps_to_csr(bitmaps: np.ndarray, n_steps: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Block sizes of every bitmap row in CSR layout: `(flat, offsets)`, with
+    row i's blocks in `flat[offsets[i]:offsets[i + 1]]`.
+    """
+    bitmaps = np.atleast_2d(bitmaps)
+    bits = np.unpackbits(
+        np.ascontiguousarray(bitmaps).view(np.uint8), axis=1, count=n_steps, bitorder="little"
+    )
+    # Every row has bit 0 set, so in the flattened (m * T) bit string each
+    # block simply ends where the next set bit, in this row or the next, is.
+    starts = np.flatnonzero(bits.view(bool).ravel())
+    sizes = np.diff(np.append(starts, bits.size))
+    offsets = np.searchsorted(starts, np.arange(len(bitmaps) + 1) * n_steps)
+    return sizes, offsets
+
+
+def bitmaps_to_partitions(bitmaps: np.ndarray, n_steps: int) -> list[np.ndarray]:
+    flat, offsets = bitmaps_to_csr(bitmaps, n_steps)
+    return np.split(flat, offsets[1:-1])
+
+
+def pairwise_common_resolution(bitmaps: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Bitmaps of `common(bitmaps[left[i]], bitmaps[right[i]])` for every i."""
+    return bitmaps[left] | bitmaps[right]
+
+
+def grouped_common_resolution(bitmaps: np.ndarray, group_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    OR of the bitmaps within each group. Returns `(groups, common)` where
+    `groups` are the sorted unique group ids and `common[g]` their bitmap.
+    """
+    groups, inverse = np.unique(group_ids, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    first = np.searchsorted(inverse[order], np.arange(len(groups)))
+    return groups, np.bitwise_or.reduceat(bitmaps[order], first, axis=0)
+
+
+def common_highest_resolution(partitions) -> np.ndarray:
+    """
+    Coarsest partition refining all of `partitions` (same total length).
+
+    >>> common_highest_resolution([[4, 2], [2, 4]]).tolist()
+    [2, 2, 2]
+    >>> common_highest_resolution([[3, 3], [2, 4]]).tolist()
+    [2, 1, 3]
+    """
+    if len(partitions) == 0:
+        return np.empty(0, dtype=np.int64)
+    n_steps = int(np.sum(partitions[0]))
+    common = np.bitwise_or.reduce(partitions_to_bitmaps(partitions, n_steps), axis=0)
+    return bitmaps_to_csr(common, n_steps)[0]
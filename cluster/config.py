@@ -0,0 +1,55 @@
+import enum
+from dataclasses import dataclass
+
+
+class ExtremePreservation(enum.Enum):
+    NO_EXTREME_PRESERVATION = "NoExtremePreservation"
+    AFTERWARDS = "Afterwards"
+    SEPERATE_EXTREMES_SUM = "SeperateExtremesSum"
+    SEPERATE_TOPS = "SeperateTops"
+    DYNAMIC_PROGRAMMING = "DynamicProgramming"
+
+
+class ClusteringMethod(enum.Enum):
+    UTR = "UTR"
+    PER_LOCATION = "PerLocation"
+    PER_PROFILE = "PerProfile"
+    DEMAND_OVER_AVAILABILITIES = "DemandOverAvailabilities"
+    GLOBAL = "Global"
+    FULL_RESOLUTION = "FullResolution"
+
+
+class Dataset(enum.Enum):
+    BASE_DATASET = "BaseDataset"
+    LOW_VAR = "LowVar"
+    HIGH_VAR = "HighVar"
+
+
+UPDATE_AFTER_CLUSTERING = (
+    ExtremePreservation.AFTERWARDS,
+    ExtremePreservation.SEPERATE_EXTREMES_SUM,
+    ExtremePreservation.SEPERATE_TOPS,
+)
+
+CONFLICT_AWARE = (
+    ExtremePreservation.SEPERATE_EXTREMES_SUM,
+    ExtremePreservation.SEPERATE_TOPS,
+)
+
+
+def should_update_extremes_after_clustering(ep: ExtremePreservation) -> bool:
+    return ep in UPDATE_AFTER_CLUSTERING
+
+
+@dataclass(frozen=True)
+class ClusteringConfig:
+    """Python counterpart of `ClusteringConfig` in config.jl (same fields and defaults)."""
+    calc_stats: bool = False
+    n_prime: int = 8760
+    extreme_preservation: ExtremePreservation = ExtremePreservation.NO_EXTREME_PRESERVATION
+    clustering_method: ClusteringMethod = ClusteringMethod.PER_LOCATION
+    high_percentile: float = 0.95
+    low_percentile: float = 0.05
+    tops_window: int = 5
+    max_block_size: int = 168
+    dataset: Dataset = Dataset.BASE_DATASET
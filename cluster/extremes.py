@@ -0,0 +1,92 @@
+"""
+Extreme-timestep detection for the extreme-preserving clustering modes.
+
+`get_is_extreme` builds the full (n, d) mask in one pass instead of calling
+`getIsExtreme` per row. For `SeperateTops` the centred window max/min of
+every column is computed with the van Herk / Gil-Werman algorithm: the
+edge-padded series is cut into blocks of the window length, and every window
+is covered by one block suffix and one block prefix. That costs O(n·d)
+regardless of `tops_window`, with no per-row window slices.
+
+During clustering the per-cluster flags are stored bit-packed, 64 columns
+per uint64 word (`pack_extremes`). OR-ing two clusters is then one word-wise
+OR, and their conflict count is `popcount(a ^ b)`. This keeps
+conflict-aware `Global` clustering, where d is the number of all profiles,
+close to plain Ward in cost.
+"""
+
+import numpy as np
+
+from cluster.config import ClusteringConfig, ExtremePreservation
+
+
+def _sliding_window(values: np.ndarray, w: int, op: np.ufunc) -> np.ndarray:
+    """Reduction of rows `[i - w, i + w]` (clipped to the series) for every row i."""
+    n, d = values.shape
+    k = 2 * w + 1
+    n_blocks = -(-(n + 2 * w) // k)
+    padded = np.pad(values, ((w, n_blocks * k - n - w), (0, 0)), mode="edge")
+    blocks = padded.reshape(n_blocks, k, d)
+
+    prefix = op.accumulate(blocks, axis=1).reshape(-1, d)
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, d)
+
+    # Window [i, i + k - 1] of the padded series = suffix of i's block + prefix of the next
+    return op(suffix[:n], prefix[k - 1:k - 1 + n])
+
+
+def sliding_window_max(values: np.ndarray, w: int) -> np.ndarray:
+    return _sliding_window(values, w, np.maximum)
+
+
+def sliding_window_min(values: np.ndarray, w: int) -> np.ndarray:
+    return _sliding_window(values, w, np.minimum)
+
+
+def get_is_extreme(
+    values: np.ndarray,
+    is_demand: np.ndarray,
+    is_renewable: np.ndarray,
+    high_thresholds: np.ndarray,
+    low_thresholds: np.ndarray,
+    config: ClusteringConfig,
+) -> np.ndarray:
+    """(n, d) extreme mask, mirroring `getIsExtreme` in cluster_ward.jl for all rows at once."""
+    ep = config.extreme_preservation
+
+    if ep in (ExtremePreservation.SEPERATE_EXTREMES_SUM, ExtremePreservation.AFTERWARDS):
+        high = values >= high_thresholds
+        low = values <= low_thresholds
+
+    elif ep == ExtremePreservation.SEPERATE_TOPS:
+        high = values == sliding_window_max(values, config.tops_window)
+        low = values == sliding_window_min(values, config.tops_window)
+
+    else:
+        return np.zeros(values.shape, dtype=bool)
+
+    return (high & is_demand) | (low & is_renewable)
+
+
+# =========================
+# Bit-packed flags
+# =========================
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def pack_extremes(is_extreme: np.ndarray) -> np.ndarray:
+    """Pack an (n, d) bool mask into (n, ceil(d / 64)) uint64 words."""
+    n, d = is_extreme.shape
+    n_words = max(1, -(-d // 64))
+    packed = np.packbits(is_extreme, axis=1, bitorder="little")
+    padded = np.zeros((n, n_words * 8), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view(np.uint64)
+
+
+def popcount(words: np.ndarray) -> int:
+    """Total number of set bits in an array of uint64 words."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(_POPCOUNT_TABLE[words.view(np.uint8)].sum())
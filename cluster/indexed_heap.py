@@ -0,0 +1,124 @@
+"""
+Addressable binary min-heap keyed by cluster index.
+
+Every candidate merge `(a, next[a])` is stored once under its left cluster
+index `a`. After a merge the affected adjacencies are re-keyed in place
+with `update` or removed with `delete`, so the heap never holds more than
+n - 1 entries and no stale entries have to be skipped on `pop`.
+
+Priorities are `(conflict, ward)` pairs compared lexicographically, with the
+index as final tie-break so the merge order is deterministic.
+"""
+
+
+class IndexedMinHeap:
+    """Min-heap over the integer ids 0..capacity-1 with decrease/increase-key and delete."""
+
+    __slots__ = ("_heap", "_pos", "_keys")
+
+    def __init__(self, capacity: int):
+        self._heap: list[int] = []
+        self._pos: list[int] = [-1] * capacity
+        self._keys: list[tuple] = [()] * capacity
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, i: int) -> bool:
+        return self._pos[i] != -1
+
+    def key(self, i: int) -> tuple:
+        return self._keys[i][:-1]
+
+    @classmethod
+    def heapify(cls, capacity: int, items) -> "IndexedMinHeap":
+        """Build a heap from `(i, conflict, ward)` items in O(n)."""
+        heap = cls(capacity)
+        for i, conflict, ward in items:
+            heap._keys[i] = (conflict, ward, i)
+            heap._pos[i] = len(heap._heap)
+            heap._heap.append(i)
+        for p in range(len(heap._heap) // 2 - 1, -1, -1):
+            heap._sift_down(p)
+        return heap
+
+    def update(self, i: int, conflict, ward: float) -> None:
+        """Insert `i` or change its priority."""
+        key = (conflict, ward, i)
+        p = self._pos[i]
+        if p == -1:
+            self._keys[i] = key
+            self._pos[i] = len(self._heap)
+            self._heap.append(i)
+            self._sift_up(len(self._heap) - 1)
+            return
+
+        old = self._keys[i]
+        self._keys[i] = key
+        if key < old:
+            self._sift_up(p)
+        else:
+            self._sift_down(p)
+
+    def delete(self, i: int) -> None:
+        """Remove `i` if present."""
+        p = self._pos[i]
+        if p == -1:
+            return
+        last = self._heap.pop()
+        self._pos[i] = -1
+        if last == i:
+            return
+        self._heap[p] = last
+        self._pos[last] = p
+        self._sift_up(p)
+        self._sift_down(self._pos[last])
+
+    def peek(self) -> int:
+        return self._heap[0]
+
+    def pop(self) -> int:
+        """Remove and return the id with the smallest priority."""
+        top = self._heap[0]
+        self.delete(top)
+        return top
+
+    # -------------------------
+    # Internal sifting
+    # -------------------------
+
+    def _sift_up(self, p: int) -> None:
+        heap, pos, keys = self._heap, self._pos, self._keys
+        i = heap[p]
+        key = keys[i]
+        while p > 0:
+            parent = (p - 1) >> 1
+            j = heap[parent]
+            if keys[j] <= key:
+                break
+            heap[p] = j
+            pos[j] = p
+            p = parent
+        heap[p] = i
+        pos[i] = p
+
+    def _sift_down(self, p: int) -> None:
+        heap, pos, keys = self._heap, self._pos, self._keys
+        size = len(heap)
+        i = heap[p]
+        key = keys[i]
+        while True:
+            child = 2 * p + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and keys[heap[right]] < keys[heap[child]]:
+                child = right
+            j = heap[child]
+            if key <= keys[j]:
+                break
+            heap[p] = j
+            pos[j] = p
+            p = child
+        heap[p] = i
+        pos[i] = p
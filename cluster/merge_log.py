@@ -0,0 +1,77 @@
+"""
+Merge log of a hierarchical Ward run and O(n) cuts at any number of clusters.
+
+The merge order of HC and EAC does not depend on `n_prime`: running down to
+k clusters performs exactly the first n - k merges of a run down to a
+single cluster. A `MergeLog` records every merge once, and `cut(k)` rebuilds
+the partition, representative values and mean values for any k without
+re-clustering, so an n_prime sweep needs one pass per (dataset, scope, method).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class MergeLog:
+    """
+    Merge sequence of one clustering run.
+
+    Step `s` merged the cluster starting at `right[s]` into its left
+    neighbour starting at `left[s]`, with priority `(conflict[s], ward[s])`.
+    The clustered data and extreme mask are kept so cuts can be evaluated.
+    """
+    left: np.ndarray          # int32 (m,)
+    right: np.ndarray         # int32 (m,)
+    conflict: np.ndarray      # int32 (m,)
+    ward: np.ndarray          # float64 (m,)
+    values: np.ndarray        # float64 (n, d)
+    is_extreme: np.ndarray    # bool (n, d)
+    is_demand: np.ndarray     # bool (d,)
+    is_renewable: np.ndarray  # bool (d,)
+    update_extremes: bool
+
+    @property
+    def n(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def min_clusters(self) -> int:
+        """Smallest number of clusters reachable from this log."""
+        return self.n - len(self.right)
+
+    def block_starts(self, k: int) -> np.ndarray:
+        """Sorted start indices of the k blocks after the first n - k merges."""
+        if not self.min_clusters <= k <= self.n:
+            raise ValueError(f"k ({k}) must lie in [{self.min_clusters}, {self.n}]")
+        is_start = np.ones(self.n, dtype=bool)
+        is_start[self.right[:self.n - k]] = False
+        return np.flatnonzero(is_start)
+
+    def cut(self, k: int):
+        """
+        `(partitions, result_values, mean_values)` of the clustering with k
+        blocks, identical to running `hierarchical_time_clustering_ward` with
+        `n_prime = k`.
+        """
+        starts = self.block_starts(k)
+        partitions = np.diff(np.append(starts, self.n))
+        mean_values = np.add.reduceat(self.values, starts, axis=0) / partitions[:, None]
+
+        if not self.update_extremes:
+            return partitions, mean_values.copy(), mean_values
+
+        extreme = np.logical_or.reduceat(self.is_extreme, starts, axis=0)
+        result_values = np.where(
+            extreme & self.is_demand, np.maximum.reduceat(self.values, starts, axis=0), mean_values
+        )
+        result_values = np.where(
+            extreme & self.is_renewable, np.minimum.reduceat(self.values, starts, axis=0), result_values
+        )
+        return partitions, result_values, mean_values
+
+    def criterion(self, k: int) -> tuple[int, float]:
+        """Priority `(conflict, ward)` of the merge that went from k + 1 to k clusters."""
+        step = self.n - k - 1
+        return int(self.conflict[step]), float(self.ward[step])
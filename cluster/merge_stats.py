@@ -0,0 +1,159 @@
+"""
+Incremental per-merge error curves (`calc_stats`) computed from a merge log.
+
+The Julia engine rebuilds the expanded centroid series, sorts it and
+recomputes both errors from scratch before every merge. Here both curves
+are updated incrementally while replaying the `MergeLog`:
+
+- SSE: the per-column increase caused by merging a and b is exactly the
+  Ward term  c_a·c_b / (c_a + c_b) · (μ_a - μ_b)².
+- LDC: the clustered load-duration curve is the set of cluster means sorted
+  in descending order, each repeated `count` times. Every mean that ever
+  exists is known from the log, so all of them are ranked once up front.
+  A Fenwick tree over those ranks gives each run's start position on the
+  curve in O(log n). A merge only moves the runs whose means lie between
+  μ_a and μ_b, so only that rank window is re-scored, using prefix sums of
+  the full-resolution curve.
+
+Cost: the SSE curve is O(d) per merge. The LDC curve is O(log n + w) per
+merge, where w is the width of the rank window. Every run in the window
+changes its position on the curve, and its error depends on the
+full-resolution values at that position, so the window cannot be updated
+as one range sum. w is O(n) in the worst case, so the LDC curve costs
+O(n · merges) overall, against O(n log n) per merge for a recomputation
+from scratch. In practice the time grows about 2.5-3x per doubling of n
+(about 1 s extra at 8760 steps and 6 s at 35040 for one column).
+"""
+
+import numpy as np
+
+from cluster.merge_log import MergeLog
+
+
+class _Fenwick:
+    """Prefix sums over ranks 0..size-1 with point updates."""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, size: int):
+        self._tree = [0] * (size + 1)
+
+    def add(self, i: int, delta: int) -> None:
+        tree = self._tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum over ranks < i."""
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+def _replay(log: MergeLog):
+    """
+    Ids of the two runs merged at every step, plus count and mean of every
+    run. Singletons are runs 0..n-1, the run created at step s is n + s.
+    """
+    n = log.n
+    m = len(log.right)
+    current = np.arange(n)
+    run_a = np.empty(m, dtype=np.int64)
+    run_b = np.empty(m, dtype=np.int64)
+    run_counts = np.ones(n + m, dtype=np.int64)
+    run_sums = np.concatenate([log.values, np.empty((m, log.values.shape[1]))])
+
+    for s, (a, b) in enumerate(zip(log.left.tolist(), log.right.tolist())):
+        ia, ib = current[a], current[b]
+        run_a[s], run_b[s] = ia, ib
+        run_counts[n + s] = run_counts[ia] + run_counts[ib]
+        np.add(run_sums[ia], run_sums[ib], out=run_sums[n + s])
+        current[a] = n + s
+
+    return run_a, run_b, run_counts, run_sums / run_counts[:, None]
+
+
+def _ldc_sse_column(full_desc, run_a, run_b, run_counts, run_means):
+    """Squared LDC error of one column before every merge step."""
+    n = len(full_desc)
+    m = len(run_a)
+    size = n + m
+
+    P = np.concatenate([[0.0], np.cumsum(full_desc)])
+    Q = np.concatenate([[0.0], np.cumsum(full_desc ** 2)])
+
+    order = np.argsort(-run_means, kind="stable")
+    rank = np.empty(size, dtype=np.int64)
+    rank[order] = np.arange(size)
+    means_by_rank = run_means[order]
+
+    occupancy = np.zeros(size, dtype=np.int64)
+    occupancy[rank[:n]] = 1
+    fenwick = _Fenwick(size)
+    for r in rank[:n].tolist():
+        fenwick.add(r, 1)
+
+    def window_error(lo, hi, start):
+        window = occupancy[lo:hi + 1]
+        occupied = np.flatnonzero(window)
+        counts = window[occupied]
+        means = means_by_rank[lo + occupied]
+        ends = start + np.cumsum(counts)
+        starts = ends - counts
+        return float(np.sum(
+            Q[ends] - Q[starts] - 2.0 * means * (P[ends] - P[starts]) + counts * means ** 2
+        ))
+
+    errors = np.empty(m)
+    err = 0.0
+    for s in range(m):
+        errors[s] = err
+        ia, ib, new = int(run_a[s]), int(run_b[s]), n + s
+        ra, rb, rn = int(rank[ia]), int(rank[ib]), int(rank[new])
+        lo = min(ra, rb, rn)
+        hi = max(ra, rb, rn)
+
+        start = fenwick.prefix(lo)
+        err -= window_error(lo, hi, start)
+
+        occupancy[ra] = 0
+        occupancy[rb] = 0
+        occupancy[rn] = run_counts[new]
+        fenwick.add(ra, -int(run_counts[ia]))
+        fenwick.add(rb, -int(run_counts[ib]))
+        fenwick.add(rn, int(run_counts[new]))
+
+        err += window_error(lo, hi, start)
+
+    return errors
+
+
+def merge_errors(log: MergeLog) -> tuple[np.ndarray, np.ndarray]:
+    """
+    `(ward_errors, ldc_errors)`, each (merges × d): the SSE and the LDC RMSE
+    per column recorded before every merge, as in the Julia `calc_stats` path.
+    """
+    n, d = log.values.shape
+    m = len(log.right)
+    if m == 0:
+        return np.empty((0, d)), np.empty((0, d))
+
+    run_a, run_b, run_counts, run_means = _replay(log)
+
+    ca = run_counts[run_a][:, None]
+    cb = run_counts[run_b][:, None]
+    deltas = ca * cb / (ca + cb) * (run_means[run_a] - run_means[run_b]) ** 2
+    ward_errors = np.vstack([np.zeros((1, d)), np.cumsum(deltas, axis=0)[:-1]])
+
+    full_desc = -np.sort(-log.values, axis=0)
+    ldc_errors = np.empty((m, d))
+    for j in range(d):
+        sq = _ldc_sse_column(full_desc[:, j], run_a, run_b, run_counts, run_means[:, j])
+        ldc_errors[:, j] = np.sqrt(np.maximum(sq, 0.0) / n)
+
+    return ward_errors, ldc_errors
@@ -0,0 +1,120 @@
+"""
+Optional mpi4py backend for clustering many profiles across nodes.
+
+Rank 0 is the master. It keeps a longest-first queue of task indices, gives
+each worker rank one task, and hands out the next task to whichever rank
+reports a result first. Results therefore stream back one by one instead of
+being gathered at the end, and one expensive group (e.g. a Global profile)
+no longer makes a statically assigned rank the straggler.
+
+Every rank runs the same script: the master calls `map_master_worker` and
+all other ranks call `serve_worker` with the same task function. Runs
+locally with e.g. `mpirun -n 4 python generate_clusters.py`. With a single
+rank the master evaluates every task itself.
+
+An exception raised by `fn` on a worker is sent back in place of the result.
+The master then stops handing out tasks, waits for the tasks in flight,
+releases every worker and re-raises it. Worker statistics are keyed by rank.
+"""
+
+import traceback
+
+from cluster.parallel import WorkerStats, _timed_call
+
+TAG_TASK = 1
+TAG_RESULT = 2
+TAG_STOP = 3
+
+
+def _mpi():
+    # Imported lazily: importing mpi4py initialises MPI, which the process-pool
+    # backend must not do before forking its workers.
+    try:
+        from mpi4py import MPI
+    except ImportError as e:
+        raise ImportError("The MPI backend requires mpi4py (pip install mpi4py)") from e
+    return MPI
+
+
+def is_master() -> bool:
+    return _mpi().COMM_WORLD.Get_rank() == 0
+
+
+def serve_worker(fn) -> None:
+    """Worker-rank loop: evaluate `fn(*item)` for every task until told to stop."""
+    MPI = _mpi()
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    status = MPI.Status()
+    while True:
+        task = comm.recv(source=0, tag=MPI.ANY_TAG, status=status)
+        if status.Get_tag() == TAG_STOP:
+            return
+        i, item = task
+        try:
+            _, elapsed, result = _timed_call(fn, item)
+        except Exception as exc:
+            exc.add_note(f"Raised by task {i} on rank {rank}:\n{traceback.format_exc()}")
+            comm.send((i, exc), dest=0, tag=TAG_RESULT)
+        else:
+            comm.send((i, (rank, elapsed, result)), dest=0, tag=TAG_RESULT)
+
+
+def map_master_worker(fn, items: list[tuple], cost, on_result=None):
+    """
+    Master side of the dynamic queue. Same contract as `map_longest_first`:
+    returns the results in input order and a list of `WorkerStats`.
+
+    `on_result(i, result)`, if given, is called as soon as task `i` arrives.
+    """
+    MPI = _mpi()
+    comm = MPI.COMM_WORLD
+    order = sorted(range(len(items)), key=lambda i: cost(items[i]), reverse=True)
+    results = [None] * len(items)
+    workers: dict[int, WorkerStats] = {}
+
+    def record(i, rank, elapsed, result):
+        results[i] = result
+        stats = workers.setdefault(rank, WorkerStats(rank))
+        stats.busy_sec += elapsed
+        stats.tasks += 1
+        if on_result is not None:
+            on_result(i, result)
+
+    if comm.Get_size() == 1:
+        for i in order:
+            _, elapsed, result = _timed_call(fn, items[i])
+            record(i, 0, elapsed, result)
+        return results, list(workers.values())
+
+    queue = iter(order)
+    in_flight = 0
+    for dest in range(1, comm.Get_size()):
+        i = next(queue, None)
+        if i is None:
+            comm.send(None, dest=dest, tag=TAG_STOP)
+        else:
+            comm.send((i, items[i]), dest=dest, tag=TAG_TASK)
+            in_flight += 1
+
+    status = MPI.Status()
+    error = None
+    while in_flight:
+        i, reply = comm.recv(source=MPI.ANY_SOURCE, tag=TAG_RESULT, status=status)
+        in_flight -= 1
+        if isinstance(reply, Exception):
+            error = error or reply
+        elif error is None:
+            record(i, *reply)
+
+        source = status.Get_source()
+        nxt = None if error is not None else next(queue, None)
+        if nxt is None:
+            comm.send(None, dest=source, tag=TAG_STOP)
+        else:
+            comm.send((nxt, items[nxt]), dest=source, tag=TAG_TASK)
+            in_flight += 1
+
+    if error is not None:
+        raise error
+    return results, sorted(workers.values(), key=lambda w: w.pid)
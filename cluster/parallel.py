@@ -0,0 +1,68 @@
+"""
+Local process-pool driver for clustering many profiles on one node.
+
+Tasks are submitted longest-first (by a caller-supplied cost estimate) to a
+`ProcessPoolExecutor`. The executor hands the next queued task to whichever
+worker finishes first, so long profiles start early and short ones fill the
+gaps at the end instead of piling up behind a static round-robin split.
+Each task is timed inside its worker, which gives per-worker busy time.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+
+@dataclass
+class WorkerStats:
+    pid: int  # process id; rank for the MPI backend
+    busy_sec: float = 0.0
+    tasks: int = 0
+
+
+def _timed_call(fn, args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return os.getpid(), time.perf_counter() - start, result
+
+
+def map_longest_first(
+    fn,
+    items: list[tuple],
+    cost,
+    max_workers: int | None = None,
+    initializer=None,
+    initargs: tuple = (),
+):
+    """
+    Evaluate `fn(*item)` for every item on a process pool, most expensive first.
+
+    `fn` must be picklable (a module-level function); `initializer(*initargs)`
+    runs once per worker, e.g. to attach shared data. Returns the results in
+    input order and a list of `WorkerStats`, one per worker process.
+    """
+    order = sorted(range(len(items)), key=lambda i: cost(items[i]), reverse=True)
+    results = [None] * len(items)
+    workers: dict[int, WorkerStats] = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs) as pool:
+        futures = {pool.submit(_timed_call, fn, items[i]): i for i in order}
+        for future in as_completed(futures):
+            pid, elapsed, result = future.result()
+            results[futures[future]] = result
+            stats = workers.setdefault(pid, WorkerStats(pid))
+            stats.busy_sec += elapsed
+            stats.tasks += 1
+
+    return results, sorted(workers.values(), key=lambda w: w.pid)
+
+
+def print_worker_report(workers: list[WorkerStats], wall_sec: float) -> None:
+    """Per-worker busy time and utilisation relative to the wall-clock time."""
+    print("\n=== Worker utilisation ===")
+    for w in workers:
+        print(f"[Worker {w.pid}] {w.tasks} tasks, busy {w.busy_sec:.3f}s "
+              f"({100 * w.busy_sec / wall_sec:.1f}% of wall time)")
+    total_busy = sum(w.busy_sec for w in workers)
+    print(f"Effective parallelism: {total_busy / wall_sec:.2f}x on {len(workers)} workers")
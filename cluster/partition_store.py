@@ -0,0 +1,184 @@
+"""
+Interned storage of `assets_rep_periods_partitions` / `flows_rep_periods_partitions`.
+
+In the exported CSVs every row spells out its partition as `"9;8;16;…"`,
+and in PerLocation mode hundreds of rows repeat the same string. The
+interned format stores each distinct partition once and lets every row
+refer to it by id. One `.npz` file per table, next to the CSV:
+
+    blocks          uint16 (B,)      block sizes of all distinct partitions
+    offsets         int64  (P + 1,)  partition p is blocks[offsets[p]:offsets[p + 1]]
+    partition_id    int32  (rows,)   partition of every table row
+    col_<name>      (rows,)          the other table columns (asset, year, ...)
+    null_<name>     bool (rows,)     missing entries of a string column
+
+`load_partitions(directory, table)` is the entry point for the plotting
+scripts: it reads the `.npz` when present and otherwise interns the CSV on
+the fly. Convert exported experiments with
+
+    python -m cluster.partition_store inputs/db_files/*/
+
+The plotting/before scripts that use this module import `cluster`, so run
+them as modules from the repository root, e.g.
+
+    python -m plotting.before.plot_load_duration_curve
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TABLES = ("assets-rep-periods-partitions", "flows-rep-periods-partitions")
+MAX_BLOCK_SIZE = np.iinfo(np.uint16).max
+
+
+INT_TOKEN = r"\s*[+-]?\d+\s*"
+FLOAT_TOKEN = r"\s*(?:[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|(?i:[+-]?(?:nan|inf|infinity)))\s*"
+
+
+def _semicolon_text(column: pd.Series) -> pd.Series:
+    text = column.astype(object).where(column.notna(), "").astype(str).str.strip().str.lstrip(",")
+    if text.str.contains(";;", regex=False).any():
+        text = text.str.replace(r";{2,}", ";", regex=True)
+    return text.str.strip(";")
+
+
+def valid_semicolon_rows(column: pd.Series, dtype=np.float64) -> np.ndarray:
+    """
+    Boolean mask of the rows `parse_semicolon_column` accepts, so callers can
+    drop malformed rows and parse the rest instead of losing the whole column.
+    """
+    token = INT_TOKEN if np.dtype(dtype).kind in "iu" else FLOAT_TOKEN
+    return _semicolon_text(column).str.fullmatch(f"(?:{token}(?:;{token})*)?").to_numpy(dtype=bool)
+
+
+def parse_semicolon_column(column: pd.Series, dtype=np.float64) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a whole column of `"a;b;c"` strings (`partition`, `values`, ...)
+    into one flat array plus row offsets (CSR): row i is
+    `flat[offsets[i]:offsets[i + 1]]`.
+
+    The rows are joined and converted by a single `np.fromstring` call.
+    Missing rows are empty; leading commas and empty tokens are ignored.
+    """
+    text = _semicolon_text(column)
+    lengths = np.where(text.to_numpy() == "", 0, text.str.count(";").to_numpy() + 1)
+    joined = ";".join(text[lengths > 0])
+    flat = np.fromstring(joined, dtype=dtype, sep=";") if joined else np.empty(0, dtype=dtype)
+    if flat.size != lengths.sum():
+        raise ValueError("Column contains entries that are not semicolon-separated numbers")
+    return flat, np.concatenate([[0], np.cumsum(lengths)])
+
+
+def take_rows(flat: np.ndarray, offsets: np.ndarray, rows) -> tuple[np.ndarray, np.ndarray]:
+    """Select rows (positions or boolean mask) of a CSR column; returns a new `(flat, offsets)`."""
+    rows = np.arange(len(offsets) - 1)[np.asarray(rows)]
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    row_offsets = np.concatenate([[0], np.cumsum(lengths)])
+    gather = np.arange(row_offsets[-1]) - np.repeat(row_offsets[:-1] - starts, lengths)
+    return flat[gather], row_offsets
+
+
+@dataclass
+class InternedPartitions:
+    """A partition table with every distinct partition stored once."""
+    table: pd.DataFrame  # table columns without `partition`, plus `partition_id`
+    blocks: np.ndarray   # uint16
+    offsets: np.ndarray  # int64
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def n_partitions(self) -> int:
+        return len(self.offsets) - 1
+
+    def partition(self, partition_id: int) -> np.ndarray:
+        return self.blocks[self.offsets[partition_id]:self.offsets[partition_id + 1]]
+
+    def rows(self, mask=None) -> tuple[np.ndarray, np.ndarray]:
+        """Block sizes (int64) of the (selected) table rows in CSR layout `(flat, offsets)`."""
+        ids = self.table["partition_id"].to_numpy()
+        if mask is not None:
+            ids = ids[np.asarray(mask)]
+        flat, offsets = take_rows(self.blocks, self.offsets, ids)
+        return flat.astype(np.int64), offsets
+
+    def to_frame(self) -> pd.DataFrame:
+        """The table with `partition` strings again, as in the exported CSV."""
+        text = np.array(
+            [";".join(map(str, self.partition(p).tolist())) for p in range(self.n_partitions)], dtype=object
+        )
+        ids = self.table["partition_id"].to_numpy()
+        return self.table.drop(columns="partition_id").assign(partition=text[ids])
+
+
+def intern_partitions(df: pd.DataFrame) -> InternedPartitions:
+    """Intern the `partition` column of a partitions table; only distinct strings are parsed."""
+    ids, unique = pd.factorize(df["partition"].astype(str))
+    blocks, offsets = parse_semicolon_column(pd.Series(unique), np.int64)
+    if blocks.size and (blocks.min() < 1 or blocks.max() > MAX_BLOCK_SIZE):
+        raise ValueError(f"Block sizes must lie in [1, {MAX_BLOCK_SIZE}] to be stored as uint16")
+    table = df.drop(columns="partition").reset_index(drop=True).assign(partition_id=ids.astype(np.int32))
+    return InternedPartitions(table, blocks.astype(np.uint16), offsets)
+
+
+def _column_arrays(name: str, column: pd.Series) -> dict[str, np.ndarray]:
+    # String columns become fixed-width unicode arrays, which cannot hold NaN.
+    if column.dtype.kind not in "OUT":
+        return {f"col_{name}": column.to_numpy()}
+    null = column.isna().to_numpy()
+    return {f"col_{name}": column.where(~null, "").to_numpy(dtype=str), f"null_{name}": null}
+
+
+def save_interned(interned: InternedPartitions, path: Path) -> None:
+    columns = interned.table.drop(columns="partition_id")
+    arrays = {}
+    for c in columns:
+        arrays.update(_column_arrays(c, columns[c]))
+    np.savez_compressed(
+        path,
+        blocks=interned.blocks,
+        offsets=interned.offsets,
+        partition_id=interned.table["partition_id"].to_numpy(),
+        **arrays,
+    )
+
+
+def load_interned(path: Path) -> InternedPartitions:
+    with np.load(path) as data:
+        table = pd.DataFrame({k[len("col_"):]: data[k] for k in data.files if k.startswith("col_")})
+        for k in data.files:
+            if k.startswith("null_"):
+                name = k[len("null_"):]
+                table[name] = table[name].where(~data[k])
+        table["partition_id"] = data["partition_id"]
+        return InternedPartitions(table, data["blocks"], data["offsets"])
+
+
+def load_partitions(directory, table: str = "assets-rep-periods-partitions") -> InternedPartitions:
+    """Interned partitions of one exported experiment, from `.npz` or else from the CSV."""
+    directory = Path(directory)
+    npz = directory / f"{table}.npz"
+    if npz.exists():
+        return load_interned(npz)
+    return intern_partitions(pd.read_csv(directory / f"{table}.csv"))
+
+
+def convert_directory(directory) -> None:
+    """Write the interned `.npz` next to every partitions CSV of an exported experiment."""
+    directory = Path(directory)
+    for table in TABLES:
+        csv = directory / f"{table}.csv"
+        if csv.exists():
+            save_interned(intern_partitions(pd.read_csv(csv)), directory / f"{table}.npz")
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:]:
+        convert_directory(arg)
+        print(f"Interned partitions in {arg}")
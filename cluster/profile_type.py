@@ -0,0 +1,40 @@
+import enum
+
+import numpy as np
+
+
+class ProfileType(enum.Enum):
+    DEMAND = "Demand"
+    SOLAR = "Solar"
+    WIND_ONSHORE = "WindOnshore"
+    WIND_OFFSHORE = "WindOffshore"
+    ENS = "ENS"
+    UNKNOWN = "Unknown"
+
+
+RENEWABLE_TYPES = (ProfileType.SOLAR, ProfileType.WIND_ONSHORE, ProfileType.WIND_OFFSHORE)
+
+
+def get_profile_type(profile_name: str) -> ProfileType:
+    """Mirror of `getProfileType` in profile_type.jl."""
+    name = profile_name.lower()
+
+    if "demand" in name:
+        return ProfileType.DEMAND
+    elif "solar" in name:
+        return ProfileType.SOLAR
+    elif "wind_onshore" in name or "onshore" in name:
+        return ProfileType.WIND_ONSHORE
+    elif "wind_offshore" in name or "offshore" in name:
+        return ProfileType.WIND_OFFSHORE
+    elif "ens" in name:
+        return ProfileType.ENS
+    else:
+        return ProfileType.UNKNOWN
+
+
+def mode_masks(modes) -> tuple[np.ndarray, np.ndarray]:
+    """Boolean column masks for demand and renewable profiles."""
+    is_demand = np.array([m == ProfileType.DEMAND for m in modes], dtype=bool)
+    is_renewable = np.array([m in RENEWABLE_TYPES for m in modes], dtype=bool)
+    return is_demand, is_renewable
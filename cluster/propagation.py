@@ -0,0 +1,204 @@
+"""
+Propagation of clustered partitions to non-profiled assets and to flows.
+
+Python counterpart of `compute_location_common_resolutions` and
+`update_non_profiled_assets_and_flows!` in common_resolution.jl, with the
+same rules:
+
+1. A non-profiled ENS asset takes the partition of its demand asset; any
+   other non-profiled asset takes the common highest resolution of its
+   location.
+2. A flow with one profiled endpoint inherits that endpoint's partition;
+   with two, the common highest resolution of both.
+3. A flow between two non-profiled assets takes the common resolution of
+   its location, or of both locations if it crosses between them.
+
+Instead of dictionary lookups per row, assets and flows are resolved with
+index joins on (asset, rep_period, year) and on the location. Every
+candidate partition is one row of a boundary-bitmap pool (profiled assets
+followed by location commons). Each flow becomes a pair of pool rows, and
+all flows are harmonized with a single bitwise OR. Only the distinct
+resulting bitmaps are formatted back into partition strings.
+
+Common resolutions need partitions of equal length, so a period whose
+profiles differ in length is resolved once per length. A row resolved by
+several lengths keeps, like the endpoint lookup, the from_asset side first,
+then the to_asset side, then the first location common.
+
+`endpoint_flow_partitions` is the plain lookup of generate_clusters.py: a
+flow copies the partition of its from_asset, else of its to_asset.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cluster.common_resolution import (
+    bitmaps_to_csr,
+    csr_to_bitmaps,
+    grouped_common_resolution,
+    pairwise_common_resolution,
+)
+from cluster.partition_store import parse_semicolon_column
+
+PERIOD_KEYS = ("rep_period", "year")
+
+
+def location_of(assets: pd.Series) -> pd.Series:
+    """Location code of an asset: the first two characters of its name."""
+    return assets.astype(str).str[:2]
+
+
+def _partition_strings(bitmaps: np.ndarray, n_steps: int) -> np.ndarray:
+    """Format bitmap rows as `"a;b;c"`, decoding each distinct bitmap once."""
+    unique, inverse = np.unique(bitmaps, axis=0, return_inverse=True)
+    flat, offsets = bitmaps_to_csr(unique, n_steps)
+    text = np.array(
+        [";".join(map(str, flat[a:b].tolist())) for a, b in zip(offsets[:-1], offsets[1:])], dtype=object
+    )
+    return text[inverse.ravel()]
+
+
+def _ens_partner(assets: pd.Series) -> pd.Series:
+    """ENS asset name belonging to each demand asset (``demand`` -> ``ENS``)."""
+    return assets.str.replace("(?i)demand", "ENS", regex=True)
+
+
+def _propagate_period(results, assets, flows):
+    """
+    Asset and flow updates of one (rep_period, year) group whose partitions
+    all have the same length. `_priority` ranks the source of every update.
+    """
+    results = results.drop_duplicates("asset", keep="last")
+    flat, offsets = parse_semicolon_column(results["partition"], np.int64)
+    n_steps = int(flat[:offsets[1]].sum())
+    profiled = csr_to_bitmaps(flat, offsets, n_steps)
+    profiled_index = pd.Index(results["asset"])
+
+    locations = results["location"] if "location" in results else location_of(results["asset"])
+    location_names, location_common = grouped_common_resolution(profiled, locations.to_numpy(dtype=str))
+    location_index = pd.Index(location_names)
+
+    # Pool of candidate bitmaps: profiled assets, then location commons.
+    pool = np.vstack([profiled, location_common])
+    n_profiled = len(profiled)
+
+    # ── Non-profiled assets: ENS partner first, else location common ─────────
+    assets = assets[profiled_index.get_indexer(assets["asset"]) < 0]
+    is_demand = results["asset"].str.contains("demand", case=False).to_numpy()
+    ens_index = pd.Index(_ens_partner(results["asset"][is_demand]))
+    ens_rows = np.flatnonzero(is_demand)
+
+    ens = ens_index.get_indexer(assets["asset"])
+    loc = location_index.get_indexer(location_of(assets["asset"]))
+    source = np.where(ens >= 0, np.append(ens_rows, -1)[ens], np.where(loc >= 0, n_profiled + loc, -1))
+    keep = source >= 0
+    asset_updates = assets[keep].assign(
+        partition=_partition_strings(pool[source[keep]], n_steps),
+        _priority=np.where(ens >= 0, 0, 2)[keep],
+    )
+
+    # ── Flows: pair of pool rows per flow, one OR for all of them ────────────
+    f = profiled_index.get_indexer(flows["from_asset"])
+    t = profiled_index.get_indexer(flows["to_asset"])
+    from_loc = location_of(flows["from_asset"]).to_numpy()
+    to_loc = location_of(flows["to_asset"]).to_numpy()
+    fl = location_index.get_indexer(from_loc)
+    tl = location_index.get_indexer(to_loc)
+    same_loc = from_loc == to_loc
+
+    left = np.where(f >= 0, f, np.where(t >= 0, t, n_profiled + fl))
+    right = np.where(t >= 0, t, np.where(f >= 0, f, n_profiled + np.where(same_loc, fl, tl)))
+    keep = (f >= 0) | (t >= 0) | ((fl >= 0) & (same_loc | (tl >= 0)))
+    common = pairwise_common_resolution(pool, left[keep], right[keep])
+    flow_updates = flows[keep].assign(
+        partition=_partition_strings(common, n_steps),
+        _priority=np.where(f >= 0, 0, np.where(t >= 0, 1, 2))[keep],
+    )
+
+    return asset_updates, flow_updates
+
+
+def propagate_partitions(
+    results: pd.DataFrame,
+    assets: pd.DataFrame,
+    flows: pd.DataFrame,
+    period_keys=PERIOD_KEYS,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Partitions of non-profiled assets and of flows.
+
+    `results` holds the profiled assets (`asset`, `partition`, optionally
+    `location`), `assets` the asset rows to resolve (`asset`) and `flows`
+    the flow rows (`from_asset`, `to_asset`). All three carry `period_keys`.
+    Returns `(asset_updates, flow_updates)`: the resolvable rows of `assets`
+    and `flows` with `partition` and `specification = "explicit"` added.
+    """
+    keys = list(period_keys)
+    assets = assets[["asset", *keys]].drop_duplicates()
+    profiled = pd.MultiIndex.from_frame(results[[*keys, "asset"]])
+    assets = assets[~pd.MultiIndex.from_frame(assets[[*keys, "asset"]]).isin(profiled)]
+    flows = flows[["from_asset", "to_asset", *keys]].drop_duplicates()
+    asset_groups = dict(list(assets.groupby(keys)))
+    flow_groups = dict(list(flows.groupby(keys)))
+
+    flat, offsets = parse_semicolon_column(results["partition"], np.int64)
+    cum = np.concatenate([[0], np.cumsum(flat)])
+    results = results.assign(_n_steps=cum[offsets[1:]] - cum[offsets[:-1]])
+
+    asset_parts = [assets.iloc[:0].assign(partition="", _priority=0)]
+    flow_parts = [flows.iloc[:0].assign(partition="", _priority=0)]
+    for (*period, _), group in results.groupby([*keys, "_n_steps"]):
+        period = tuple(period)
+        asset_updates, flow_updates = _propagate_period(
+            group,
+            asset_groups.get(period, assets.iloc[:0]),
+            flow_groups.get(period, flows.iloc[:0]),
+        )
+        asset_parts.append(asset_updates)
+        flow_parts.append(flow_updates)
+
+    asset_updates = _first_by_priority(pd.concat(asset_parts, ignore_index=True), ["asset", *keys])
+    flow_updates = _first_by_priority(pd.concat(flow_parts, ignore_index=True), ["from_asset", "to_asset", *keys])
+    return asset_updates.assign(specification="explicit"), flow_updates.assign(specification="explicit")
+
+
+def _first_by_priority(updates: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """One update per row key, the one with the lowest `_priority` (earliest on ties)."""
+    duplicate = updates.sort_values("_priority", kind="stable").duplicated(keys)
+    return updates.drop(index=duplicate.index[duplicate], columns="_priority")
+
+
+def endpoint_flow_partitions(results: pd.DataFrame, flows: pd.DataFrame, period_keys=PERIOD_KEYS) -> pd.DataFrame:
+    """
+    Flows that touch a profiled asset, with the partition of their
+    `from_asset` if it is profiled and else of their `to_asset`. No common
+    resolution is formed, so profiles may differ in length. Every flow row is
+    kept, in order, with `specification = "explicit"`.
+    """
+    keys = list(period_keys)
+    results = results.drop_duplicates([*keys, "asset"], keep="last")
+    profiled = pd.MultiIndex.from_frame(results[[*keys, "asset"]])
+    partitions = results["partition"].to_numpy(dtype=object)
+
+    f = profiled.get_indexer(pd.MultiIndex.from_frame(flows[[*keys, "from_asset"]]))
+    t = profiled.get_indexer(pd.MultiIndex.from_frame(flows[[*keys, "to_asset"]]))
+    source = np.where(f >= 0, f, t)
+    keep = source >= 0
+    return flows[keep].assign(specification="explicit", partition=partitions[source[keep]])
+
+
+def apply_partition_updates(table: pd.DataFrame, updates: pd.DataFrame, keys) -> pd.DataFrame:
+    """
+    Bulk equivalent of `UPDATE table SET partition, specification FROM updates`
+    on `keys`: one join, rows without an update keep their values.
+    """
+    keys = list(keys)
+    merged = table.merge(
+        updates[[*keys, "partition", "specification"]].drop_duplicates(keys, keep="last"),
+        on=keys,
+        how="left",
+        suffixes=("", "_new"),
+    )
+    for column in ("partition", "specification"):
+        merged[column] = merged[f"{column}_new"].where(merged[f"{column}_new"].notna(), merged[column])
+    return merged[table.columns]
@@ -0,0 +1,83 @@
+"""
+Profile matrix in shared memory for the parallel clustering workers.
+
+The parent loads every profile once into a (T, P) float64 matrix backed by
+`multiprocessing.shared_memory`. Columns are contiguous (Fortran order) and
+padded with NaN past each profile's length. Worker processes attach to the
+block once, in the pool initializer, and afterwards receive only column
+indices. `worker_column(j)` returns a zero-copy view, so neither startup nor
+per-task IPC grows with the number of profiles or weather years.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedMatrixHandle:
+    """Picklable description of a `SharedProfileMatrix` for worker processes."""
+    shm_name: str
+    shape: tuple[int, int]
+    lengths: tuple[int, ...]
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    # Attaching must not register the block with this process' resource
+    # tracker, or it would be unlinked when the worker exits (Python >= 3.13).
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _as_matrix(shm: shared_memory.SharedMemory, shape: tuple[int, int]) -> np.ndarray:
+    return np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order="F")
+
+
+class SharedProfileMatrix:
+    """Owner of the shared (T, P) profile matrix; use as a context manager."""
+
+    def __init__(self, columns: list[np.ndarray]):
+        lengths = tuple(len(c) for c in columns)
+        shape = (max(lengths, default=0), len(columns))
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 8))
+        self.array = _as_matrix(self._shm, shape)
+        self.array.fill(np.nan)
+        for j, column in enumerate(columns):
+            self.array[:lengths[j], j] = column
+        self.handle = SharedMatrixHandle(self._shm.name, shape, lengths)
+
+    def column(self, j: int) -> np.ndarray:
+        return self.array[:self.handle.lengths[j], j]
+
+    def __enter__(self) -> "SharedProfileMatrix":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        del self.array
+        self._shm.close()
+        self._shm.unlink()
+
+
+# =========================
+# Worker side
+# =========================
+
+_worker_shm = None
+_worker_matrix = None
+_worker_lengths = ()
+
+
+def attach_worker(handle: SharedMatrixHandle) -> None:
+    """Pool initializer: map the shared matrix into this worker process."""
+    global _worker_shm, _worker_matrix, _worker_lengths
+    _worker_shm = _open(handle.shm_name)
+    _worker_matrix = _as_matrix(_worker_shm, handle.shape)
+    _worker_lengths = handle.lengths
+
+
+def worker_column(j: int) -> np.ndarray:
+    """Zero-copy view of profile column j inside a worker."""
+    return _worker_matrix[:_worker_lengths[j], j]
@@ -0,0 +1,119 @@
+"""
+Streaming windowed clustering for series that do not fit in memory at once.
+
+A 30-year hourly or 15-minute series is consumed window by window (e.g. one
+month of rows at a time, read from a memory-mapped `.npy` with
+`iter_windows`). Each window is appended to the unfinished tail of the
+previous one and the buffer is clustered with the regular engine. Blocks
+that end at least `overlap` steps before the end of the buffer are
+finalized and emitted. The remaining tail is carried over raw and
+re-clustered together with the next window, so blocks that straddle a
+window boundary are stitched instead of being cut at it.
+
+The cluster budget follows the global compression ratio
+`n_prime / total_length`. A buffer is owed `floor(steps * ratio)` clusters
+for all steps seen so far, minus those already emitted; the fractional
+remainder carries over, and a buffer that is owed none is carried whole.
+The last window finalizes everything, so the stream ends with exactly
+`n_prime` blocks covering `total_length` steps.
+
+A tail longer than `max_tail` is cut back by finalizing more blocks, even
+inside the overlap zone. Memory is bounded by one window plus `max_tail`,
+except while no cluster is owed yet, when the carried buffer holds at most
+about `total_length / n_prime` steps.
+
+Extreme detection compares against percentile thresholds. Pass the
+thresholds of the full series (e.g. from a `ThresholdCache`) to detect the
+same extremes as a one-shot run. Without them, each buffer uses its own
+percentiles.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+
+from cluster.cluster_ward import hierarchical_time_clustering_ward
+from cluster.config import ClusteringConfig
+
+
+def iter_windows(values, window: int):
+    """Consecutive row slices of `values`; slicing a memmap reads only that window."""
+    for start in range(0, len(values), window):
+        yield values[start:start + window]
+
+
+def stream_time_clustering_ward(
+    windows,
+    modes,
+    total_length: int,
+    config: ClusteringConfig = ClusteringConfig(),
+    overlap: int = 168,
+    thresholds=None,
+    max_tail: int | None = None,
+):
+    """
+    Cluster a stream of (m × d) windows into `config.n_prime` contiguous blocks.
+
+    Yields `(partitions, result_values, mean_values)` for every batch of
+    finalized blocks, in time order. `total_length` is the number of rows
+    the stream will deliver. `max_tail` caps the carried tail; it defaults
+    to `2 * overlap` plus the mean block length.
+    """
+    if overlap < 0:
+        raise ValueError("overlap must be non-negative")
+    if not 1 <= config.n_prime <= total_length:
+        raise ValueError("n_prime must lie in [1, total_length]")
+    if max_tail is None:
+        max_tail = 2 * overlap + -(-total_length // config.n_prime)
+    window_config = replace(config, calc_stats=False)
+
+    def cluster(buffer, k):
+        partitions, result_values, mean_values, _, _ = hierarchical_time_clustering_ward(
+            buffer, modes, replace(window_config, n_prime=k), thresholds
+        )
+        return partitions, result_values, mean_values
+
+    tail = None
+    done_steps = 0
+    done_clusters = 0
+
+    for window in windows:
+        window = np.asarray(window, dtype=np.float64)
+        if window.ndim == 1:
+            window = window.reshape(-1, 1)
+        buffer = window if tail is None else np.concatenate([tail, window])
+        m = len(buffer)
+        if done_steps + m > total_length:
+            raise ValueError(f"stream is longer than total_length ({total_length})")
+        last = done_steps + m == total_length
+
+        # Floor keeps the fractional budget for later buffers: never more than owed.
+        owed = (done_steps + m) * config.n_prime // total_length - done_clusters
+        if owed == 0 and not last:
+            tail = buffer
+            continue
+        partitions, result_values, mean_values = cluster(buffer, min(owed, m))
+
+        if last:
+            n_final = len(partitions)
+        else:
+            # Blocks ending before the overlap zone are final; the rest is re-clustered.
+            cum = np.cumsum(partitions)
+            n_final = int(np.searchsorted(cum, m - overlap, side="right"))
+            if m - (cum[n_final - 1] if n_final else 0) > max_tail:
+                n_final = int(np.searchsorted(cum, m - max_tail, side="left")) + 1
+        steps = int(partitions[:n_final].sum())
+        if n_final:
+            yield partitions[:n_final], result_values[:n_final], mean_values[:n_final]
+        done_steps += steps
+        done_clusters += n_final
+        tail = buffer[steps:]
+
+    if done_steps != total_length:
+        raise ValueError(f"stream is shorter than total_length ({total_length})")
+
+
+def streamed_time_clustering_ward(windows, modes, total_length: int, config=ClusteringConfig(), **kwargs):
+    """`stream_time_clustering_ward` collected into `(partitions, result_values, mean_values)`."""
+    parts = list(stream_time_clustering_ward(windows, modes, total_length, config, **kwargs))
+    return tuple(np.concatenate([p[i] for p in parts]) for i in range(3))
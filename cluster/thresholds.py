@@ -0,0 +1,79 @@
+"""
+High/low percentile thresholds for the extreme-preserving clustering modes.
+
+Both Julia engines sort every column to read the `ceil(p·n)`-th smallest
+value (1-based). `compute_thresholds` selects the two order statistics for
+a whole (n, d) matrix with one `np.partition` along axis 0, which is O(n·d)
+instead of O(n·d·log n).
+
+A column's thresholds depend only on that profile's own series, not on how
+profiles are grouped for clustering. `ThresholdCache` therefore keeps them
+per dataset and profile name, optionally on disk, so the experiments of a
+sweep over the same dataset never recompute them.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+def threshold_index(percentile: float, n: int) -> int:
+    """0-based row of the `ceil(p·n)`-th smallest value, as in the Julia engines."""
+    return int(np.ceil(percentile * n)) - 1
+
+
+def compute_thresholds(values: np.ndarray, high_percentile: float, low_percentile: float):
+    """Per-column `(high_thresholds, low_thresholds)` of an (n, d) matrix."""
+    n = values.shape[0]
+    high_idx = threshold_index(high_percentile, n)
+    low_idx = threshold_index(low_percentile, n)
+    selected = np.partition(values, sorted({low_idx, high_idx}), axis=0)
+    return selected[high_idx].copy(), selected[low_idx].copy()
+
+
+class ThresholdCache:
+    """Per-profile thresholds of one dataset, computed once per percentile pair."""
+
+    def __init__(self, dataset: str, cache_dir: Path | None = None):
+        self.dataset = dataset
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._tables: dict[tuple[float, float], dict[str, tuple[float, float]]] = {}
+
+    def _path(self, high_percentile: float, low_percentile: float) -> Path:
+        return self.cache_dir / f"thresholds_{self.dataset}_hp{high_percentile}_lp{low_percentile}.npz"
+
+    def _table(self, high_percentile: float, low_percentile: float) -> dict[str, tuple[float, float]]:
+        key = (high_percentile, low_percentile)
+        if key not in self._tables:
+            table = {}
+            if self.cache_dir is not None and self._path(*key).exists():
+                with np.load(self._path(*key)) as data:
+                    table = dict(zip(data["names"].tolist(), zip(data["high"].tolist(), data["low"].tolist())))
+            self._tables[key] = table
+        return self._tables[key]
+
+    def lookup(self, profile_names, values: np.ndarray, high_percentile: float, low_percentile: float):
+        """
+        Thresholds for the columns of `values`, named by `profile_names`.
+        Only profiles not seen before for this percentile pair are computed.
+        """
+        table = self._table(high_percentile, low_percentile)
+        missing = [j for j, name in enumerate(profile_names) if name not in table]
+
+        if missing:
+            high, low = compute_thresholds(values[:, missing], high_percentile, low_percentile)
+            for j, h, l in zip(missing, high.tolist(), low.tolist()):
+                table[profile_names[j]] = (h, l)
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                names = list(table)
+                np.savez(
+                    self._path(high_percentile, low_percentile),
+                    names=np.array(names),
+                    high=np.array([table[name][0] for name in names]),
+                    low=np.array([table[name][1] for name in names]),
+                )
+
+        high = np.array([table[name][0] for name in profile_names], dtype=np.float64)
+        low = np.array([table[name][1] for name in profile_names], dtype=np.float64)
+        return high, low
@@ -5,14 +5,16 @@ from pathlib import Path
 import shutil
 import time
 
+import numpy as np
 import pandas as pd
 
-from cluster.cluster_integral_cost import hierarchical_time_clustering_integral_cost
-from cluster.cluster_peaks_and_lows import hierarchical_time_clustering_peaks_and_lows
 from cluster.cluster_ward import hierarchical_time_clustering_ward
-from cluster.cluster_ward_variance_penalty import hierarchical_time_clustering_penalized
-from plot_integral_sorted_curve import plot_integral_sorted_curve
-from cluster.cluster_ward_quantile import hierarchical_time_clustering_quantile
+from cluster.config import ClusteringConfig
+from cluster.mpi_backend import is_master, map_master_worker, serve_worker
+from cluster.parallel import map_longest_first, print_worker_report
+from cluster.profile_type import get_profile_type
+from cluster.propagation import endpoint_flow_partitions
+from cluster.shared_profiles import SharedProfileMatrix, attach_worker, worker_column
 
 
 class ClusterMethod(enum.Enum):
@@ -22,9 +24,17 @@ class ClusterMethod(enum.Enum):
     PENALIZED = "penalized"
     PEAKS_AND_LOWS = "peaks_and_lows"
 
-CURRENT_CLUSTER_METHOD = ClusterMethod.PEAKS_AND_LOWS
-PLOT_INTEGRAL_SORTED_CURVE = True
+
+class ParallelBackend(enum.Enum):
+    PROCESS_POOL = "process_pool"  # one node, shared-memory profile matrix
+    MPI = "mpi"  # mpirun -n N python generate_clusters.py
+
+# Only WARD ships with this repo; the other methods import their modules when selected.
+CURRENT_CLUSTER_METHOD = ClusterMethod.WARD
+PLOT_INTEGRAL_SORTED_CURVE = False
 NUMBER_CLUSTERS = 672
+NUM_WORKERS = None  # None = all cores (process pool only)
+PARALLEL_BACKEND = ParallelBackend.PROCESS_POOL
 
 INPUT_FILES_PROFILES = [
     "profiles-rep-periods-demand.csv",
@@ -37,73 +47,64 @@ OUTPUT_PATH = f"Cases/C{NUMBER_CLUSTERS}_{CURRENT_CLUSTER_METHOD.value}/"
 ASSETS_OUTPUT_FILE = OUTPUT_PATH + "assets-rep-periods-partitions.csv"
 FLOWS_OUTPUT_FILE = OUTPUT_PATH + "flows-rep-periods-partitions.csv"
 
-# Only rank 0 creates output directory and copies files
-if rank == 0:
-    os.makedirs(OUTPUT_PATH, exist_ok=True)
-    for file in Path("Cases/1h").glob("*.csv"):
-        shutil.copy(file, Path(OUTPUT_PATH[:-1]) / file.name)
-
-# Wait for rank 0 to finish setup
-comm.Barrier()
 
-# === LOAD DATA AND DISTRIBUTE WORK ===
-overall_start = time.time()
-
-if rank == 0:
-    # Rank 0 loads all profiles and distributes them
+# === LOAD DATA ===
+def load_profiles():
     all_profiles = []
-    
+
     for input_file in INPUT_FILES_PROFILES:
         csv_path = INPUT_PATH + input_file
         df = pd.read_csv(csv_path, header=1)
         df = df.dropna(subset=["value"])
-        
+
         for profile, group in df.groupby("profile_name"):
             values = group.sort_values("time_step")["value"].to_numpy()
             all_profiles.append((profile, values))
-    
-    print(f"Total profiles to process: {len(all_profiles)}")
-    print(f"Using {size} MPI processes")
-    
-    # Distribute profiles to workers
-    profiles_per_rank = [[] for _ in range(size)]
-    for i, profile_data in enumerate(all_profiles):
-        profiles_per_rank[i % size].append(profile_data)
-else:
-    profiles_per_rank = None
-
-# Scatter profiles to all ranks
-my_profiles = comm.scatter(profiles_per_rank, root=0)
-
-# === PROCESS PROFILES IN PARALLEL ===
-my_results = []
-my_stats = []
-
-for profile, values in my_profiles:
+
+    return all_profiles
+
+
+# === PROCESS ONE PROFILE (runs in a worker process) ===
+def cluster_profile_column(profile, column):
+    return cluster_profile(profile, worker_column(column))
+
+
+def cluster_profile(profile, values):
     start_time = time.time()
-    
+
     if CURRENT_CLUSTER_METHOD == ClusterMethod.WARD:
-        clusters, stats = hierarchical_time_clustering_ward(values, NUMBER_CLUSTERS)
+        clusters, _, mean_values, _, _ = hierarchical_time_clustering_ward(
+            values, [get_profile_type(str(profile))], ClusteringConfig(n_prime=NUMBER_CLUSTERS)
+        )
+        stats = {
+            "num_clusters": len(clusters),
+            "total_error": float(np.sum((values - np.repeat(mean_values[:, 0], clusters)) ** 2)),
+        }
     elif CURRENT_CLUSTER_METHOD == ClusterMethod.INTEGRAL_COST:
+        from cluster.cluster_integral_cost import hierarchical_time_clustering_integral_cost
         clusters, stats = hierarchical_time_clustering_integral_cost(values, NUMBER_CLUSTERS)
     elif CURRENT_CLUSTER_METHOD == ClusterMethod.QUANTILE:
+        from cluster.cluster_ward_quantile import hierarchical_time_clustering_quantile
         alpha = 0.25 if "Solar" in str(profile) else 0.75
         clusters, stats = hierarchical_time_clustering_quantile(
             values, NUMBER_CLUSTERS, alpha=0.25
         )
     elif CURRENT_CLUSTER_METHOD == ClusterMethod.PENALIZED:
+        from cluster.cluster_ward_variance_penalty import hierarchical_time_clustering_penalized
         clusters, stats = hierarchical_time_clustering_penalized(values, NUMBER_CLUSTERS, lam=10.0)
     elif CURRENT_CLUSTER_METHOD == ClusterMethod.PEAKS_AND_LOWS:
+        from cluster.cluster_peaks_and_lows import hierarchical_time_clustering_peaks_and_lows
         clusters, stats = hierarchical_time_clustering_peaks_and_lows(values, NUMBER_CLUSTERS, alpha=0.03)
     else:
         raise ValueError("Unknown clustering method")
-    
+
     if PLOT_INTEGRAL_SORTED_CURVE and str(profile).startswith("N"):
+        from plot_integral_sorted_curve import plot_integral_sorted_curve
         plot_integral_sorted_curve(values, clusters, profile, f"C{NUMBER_CLUSTERS}_{CURRENT_CLUSTER_METHOD.value}")
-    
+
     ratio = len(clusters) / len(values)
     elapsed = time.time() - start_time
-    
+
     # Store stats
     if stats is not None:
         stats.update(
@@ -114,24 +115,54 @@ for profile, values in my_profiles:
                 "runtime_sec": elapsed,
             }
         )
-        my_stats.append(stats)
-    
+
     profile_row = [profile, "1", "explicit", ";".join(map(str, clusters))]
-    my_results.append(profile_row)
-    
-    print(f"[Rank {rank}] [{profile}] {len(clusters)} clusters from {len(values)} steps "
+
+    print(f"[Worker {os.getpid()}] [{profile}] {len(clusters)} clusters from {len(values)} steps "
           f"(runtime={elapsed:.3f}s)")
 
-# === GATHER RESULTS FROM ALL RANKS ===
-all_results = comm.gather(my_results, root=0)
-all_stats = comm.gather(my_stats, root=0)
+    return profile_row, stats
 
-# === SAVE RESULTS (ONLY RANK 0) ===
-if rank == 0:
-    # Flatten results from all ranks
-    all_results = [item for sublist in all_results for item in sublist] # type: ignore
-    all_stats = [item for sublist in all_stats for item in sublist] # type: ignore
-    
+
+def cluster_all(all_profiles):
+    """Cluster every profile on the configured backend, most expensive first."""
+    if PARALLEL_BACKEND == ParallelBackend.MPI:
+        return map_master_worker(cluster_profile, all_profiles, cost=lambda item: len(item[1]))
+
+    # Workers read their column straight from shared memory; tasks carry only indices.
+    with SharedProfileMatrix([values for _, values in all_profiles]) as matrix:
+        lengths = matrix.handle.lengths
+        return map_longest_first(
+            cluster_profile_column,
+            [(profile, j) for j, (profile, _) in enumerate(all_profiles)],
+            cost=lambda item: lengths[item[1]],
+            max_workers=NUM_WORKERS,
+            initializer=attach_worker,
+            initargs=(matrix.handle,),
+        )
+
+
+def main():
+    if PARALLEL_BACKEND == ParallelBackend.MPI and not is_master():
+        serve_worker(cluster_profile)
+        return
+
+    os.makedirs(OUTPUT_PATH, exist_ok=True)
+    for file in Path("Cases/1h").glob("*.csv"):
+        shutil.copy(file, Path(OUTPUT_PATH[:-1]) / file.name)
+
+    overall_start = time.time()
+
+    all_profiles = load_profiles()
+    print(f"Total profiles to process: {len(all_profiles)}")
+    print(f"Parallel backend: {PARALLEL_BACKEND.value}")
+
+    # === PROCESS PROFILES IN PARALLEL (longest first, dynamic scheduling) ===
+    outputs, workers = cluster_all(all_profiles)
+    all_results = [row for row, _ in outputs]
+    all_stats = [stats for _, stats in outputs if stats is not None]
+
+    # === SAVE RESULTS ===
     # Save clustered results
     columns = pd.MultiIndex.from_tuples(
         [
@@ -141,11 +172,11 @@ if rank == 0:
             ("", "partition"),
         ]
     )
-    
+
     out_df = pd.DataFrame(all_results, columns=[c[1] for c in columns])
     out_df.columns = columns
     out_df.to_csv(ASSETS_OUTPUT_FILE, index=False)
-    
+
     # Save statistics
     total_time = time.time() - overall_start
     if all_stats:
@@ -164,22 +195,20 @@ if rank == 0:
                 ]
             ]
         )
-    
+
+    print_worker_report(workers, total_time)
     print(f"\nTotal runtime: {total_time:.3f} seconds")
-    print(f"Speedup: {total_time / (total_time / size):.2f}x (theoretical)")
     print(f"Saved clustered results to: {ASSETS_OUTPUT_FILE}")
-    
+
     # === GENERATE FLOWS OUTPUT ===
     print("start generating: " + FLOWS_OUTPUT_FILE)
-    result_mapping = {p: c for p, _, _, c in all_results}
+    results = pd.DataFrame(all_results, columns=["asset", "rep_period", "specification", "partition"])
     csv_path = INPUT_PATH + INPUT_FILE_FLOW
     df = pd.read_csv(csv_path, header=1)
-    flow_result = []
-    for row in df.values:
-        result = result_mapping.get(row[1]) or result_mapping.get(row[2])
-        if result:
-            flow_result.append([row[1], row[2], "1", "explicit", result])
-    
+    flows = pd.DataFrame({"from_asset": df.iloc[:, 1], "to_asset": df.iloc[:, 2], "rep_period": "1"})
+    # A flow copies the partition of its first profiled endpoint (from, then to)
+    flow_updates = endpoint_flow_partitions(results, flows, period_keys=("rep_period",))
+
     columns = pd.MultiIndex.from_tuples(
         [
             ("", "from_asset"),
@@ -189,11 +218,12 @@ if rank == 0:
             ("", "partition"),
         ]
     )
-    out_df = pd.DataFrame(flow_result, columns=[c[1] for c in columns])
+    out_df = flow_updates[[c[1] for c in columns]].copy()
     out_df.columns = columns
     out_df.to_csv(FLOWS_OUTPUT_FILE, index=False)
-    
+
     print(f"Saved flows results to: {FLOWS_OUTPUT_FILE}")
 
-# Ensure all processes finish before exiting
-comm.Barrier()
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
-import re
+import sys
+
 import pandas as pd
 from pathlib import Path
 
+from experiment_catalog import CATALOG_COLUMNS, with_catalog
+from input_manifest import Manifest
+from log_index import LogIndex, build_log_index
+from results_store import STORE_DIR, read_results, read_run_names, result_files
+
 # ── Investment cost constants (from Julia script) ────────────────────────────
 INVESTMENT_COSTS = {
     "Wind_Onshore":  77356.32865703155,
@@ -16,93 +22,102 @@ INVESTMENT_COSTS = {
 RENEWABLE_TYPES = {"Wind_Onshore", "Wind_Offshore", "Solar"}
 
 
-def get_asset_type(asset_name: str) -> str | None:
-    """Determine asset type from asset name (e.g. 'BE_Wind_Onshore' -> 'Wind_Onshore')."""
-    parts = asset_name.split("_")
-    if len(parts) < 2:
-        return None
-    type_str = "_".join(parts[1:])
-    return type_str if type_str in INVESTMENT_COSTS else None
+ASSET_TYPES = pd.CategoricalDtype(sorted(INVESTMENT_COSTS))
+
+
+def get_asset_types(asset_names: pd.Series) -> pd.Series:
+    """Categorical asset type from asset names (e.g. 'BE_Wind_Onshore' -> 'Wind_Onshore'); NaN if unknown."""
+    return asset_names.str.split("_", n=1).str[1].astype(ASSET_TYPES)
 
 
-def load_asset_capacities(asset_csv_path: Path) -> dict[str, float]:
-    """Load asset capacities from the reference asset.csv."""
-    df = pd.read_csv(asset_csv_path)
-    return {str(row["asset"]): float(row["capacity"]) for _, row in df.iterrows()}
+def load_asset_capacities(asset_csv_path: Path) -> pd.Series:
+    """Load asset capacities from the reference asset.csv, indexed by asset."""
+    df = pd.read_csv(asset_csv_path, usecols=["asset", "capacity"])
+    return df.set_index(df["asset"].astype(str))["capacity"].astype(float)
 
 
-def calculate_investment_costs(investment_csv_path: Path, asset_capacities: dict) -> dict:
+def load_investments(experiment_names, pattern: str) -> pd.DataFrame:
+    """All var_assets_investment.csv files as one long frame tagged by experiment."""
+    frames = []
+    for name in experiment_names:
+        path = Path(pattern.format(experiment_name=name))
+        if path.exists():
+            frames.append(pd.read_csv(path, usecols=["asset", "solution"]).assign(experiment=name))
+        else:
+            print(f"  [WARN] Investment CSV not found: {path}")
+    if not frames:
+        return pd.DataFrame(columns=["asset", "solution", "experiment"])
+    df = pd.concat(frames, ignore_index=True)
+    df["asset"] = df["asset"].astype(str)
+    df["experiment"] = df["experiment"].astype("category")
+    return df
+
+
+def calculate_investment_costs(investments: pd.DataFrame, asset_capacities: pd.Series) -> pd.DataFrame:
     """
-    Calculate investment costs and capacities per technology for one experiment,
+    Investment costs and capacities per technology for every experiment at once,
     mirroring the Julia calculate_costs_and_capacity_per_technology function.
-    Returns a flat dict of cost_<Tech> and capacity_<Tech> columns.
+    Returns one row per experiment with cost_<Tech> and capacity_<Tech> columns.
     """
-    df = pd.read_csv(investment_csv_path)
-    costs = {}
-    capacities = {}
-
-    for _, row in df.iterrows():
-        asset_name = str(row["asset"])
-        asset_type = get_asset_type(asset_name)
-        if asset_type is None:
-            print(f"  [WARN] Unknown asset type for: {asset_name} — skipping")
-            continue
-
-        unit_capacity = asset_capacities.get(asset_name, 0.0)
-        if unit_capacity == 0.0 and asset_name not in asset_capacities:
-            print(f"  [WARN] No capacity found for asset: {asset_name} — skipping ")
-        elif unit_capacity == 0.0:
-            if row["solution"] > 0:
-                print(f"  [ERROR] capacity found for asset is 0: {asset_name} - skipping")
-            continue
-
-        costs[asset_type]      = costs.get(asset_type, 0.0)      + INVESTMENT_COSTS[asset_type] * row["solution"] * unit_capacity
-        capacities[asset_type] = capacities.get(asset_type, 0.0) + unit_capacity * row["solution"]
-
-    total_cost           = sum(costs.values())
-    renewable_cost       = sum(costs.get(t, 0.0) for t in RENEWABLE_TYPES)
-    total_capacity       = sum(capacities.values())
-    renewable_capacity   = sum(capacities.get(t, 0.0) for t in RENEWABLE_TYPES)
-
-    result = {
-        "investment_cost":            total_cost,
-        "investment_cost_renewables": renewable_cost,
-        "total_capacity":             total_capacity,
-        "renewables_capacity":        renewable_capacity,
-    }
-    for t in sorted(INVESTMENT_COSTS):
-        result[f"cost_{t}"]     = costs.get(t, 0.0)
-        result[f"capacity_{t}"] = capacities.get(t, 0.0)
-
+    df = investments.assign(asset_type=get_asset_types(investments["asset"]))
+
+    unknown = df.loc[df["asset_type"].isna(), "asset"].unique()
+    for asset_name in unknown:
+        print(f"  [WARN] Unknown asset type for: {asset_name} — skipping")
+    df = df[df["asset_type"].notna()]
+
+    unit_capacity = df["asset"].map(asset_capacities)
+    for asset_name in df.loc[unit_capacity.isna(), "asset"].unique():
+        print(f"  [WARN] No capacity found for asset: {asset_name} — skipping ")
+    for asset_name in df.loc[(unit_capacity == 0.0) & (df["solution"] > 0), "asset"].unique():
+        print(f"  [ERROR] capacity found for asset is 0: {asset_name} - skipping")
+    unit_capacity = unit_capacity.fillna(0.0)
+
+    price = df["asset_type"].map(INVESTMENT_COSTS).astype(float)
+    df = df.assign(cost=price * df["solution"] * unit_capacity, capacity=unit_capacity * df["solution"])
+
+    per_type = (
+        df.groupby(["experiment", "asset_type"], observed=False)[["cost", "capacity"]].sum()
+        .unstack("asset_type", fill_value=0.0)
+        .reindex(columns=pd.MultiIndex.from_product([["cost", "capacity"], ASSET_TYPES.categories]))
+    )
+    costs, capacities = per_type["cost"], per_type["capacity"]
+    renewables = sorted(RENEWABLE_TYPES)
+
+    result = pd.DataFrame({
+        "investment_cost":            costs.sum(axis=1),
+        "investment_cost_renewables": costs[renewables].sum(axis=1),
+        "total_capacity":             capacities.sum(axis=1),
+        "renewables_capacity":        capacities[renewables].sum(axis=1),
+    })
+    for t in ASSET_TYPES.categories:
+        result[f"cost_{t}"]     = costs[t]
+        result[f"capacity_{t}"] = capacities[t]
+
+    result.index = result.index.astype(str)
     return result
 
 
-def extract_4th_optimal_objective(log_path: Path) -> float | None:
+def extract_4th_optimal_objective(objectives: list[float], log_path: Path) -> float | None:
     """
-    Search for all 'Optimal objective' lines in a log file and return the 4th value.
-    Returns None if fewer than 4 are found.
+    Return the 4th 'Optimal objective' value of a log (the 3rd if there are only 3).
+    Returns None if fewer than 3 are found.
     """
-    pattern = re.compile(r"Optimal objective\s+([\d.e+\-]+)")
-    matches = pattern.findall(log_path.read_text(errors="replace"))
-    if len(matches) < 3:
-        print(f"  [WARN] Only {len(matches)} 'Optimal objective' found in {log_path.name} (need 4)")
+    if len(objectives) < 3:
+        print(f"  [WARN] Only {len(objectives)} 'Optimal objective' found in {log_path.name} (need 4)")
         return None
-    elif len(matches) == 3:
-        return float(matches[2])
+    elif len(objectives) == 3:
+        return objectives[2]
     else:
-        return float(matches[3])  # 4th match (0-indexed)
+        return objectives[3]  # 4th match (0-indexed)
 
 
-def find_log_for_experiment(experiment_name: str, log_dir: Path) -> Path | None:
+def find_log_for_experiment(experiment_name: str, log_index: LogIndex) -> Path | None:
     """
-    Find the log file(s) whose content contains the given experiment name.
+    Find the log file(s) that ran the given experiment.
     If multiple logs match, print their names and return the most recent one.
     """
-    matches = []
-    for log_file in sorted(log_dir.glob("*.log")):
-        text = log_file.read_text(errors="replace")
-        if f"Experiment: {experiment_name}" in text:
-            matches.append(log_file)
+    matches = log_index.logs_for(experiment_name)
 
     if not matches:
         print(f"  [WARN] No log found for experiment: {experiment_name}")
@@ -118,10 +133,11 @@ def find_log_for_experiment(experiment_name: str, log_dir: Path) -> Path | None:
 
 
 # ── Paths ─────────────────────────────────────────────────────────────────────
-input_dir   = Path("plotting/csv_data/regret")
-output_file = Path("plotting/csv_data/regret.csv")
-log_dir     = Path("logs")
-asset_csv   = Path("inputs/db_files/obz-invest-full-resolution/asset.csv")
+input_dir     = Path("plotting/csv_data/regret")
+output_file   = Path("plotting/csv_data/regret.csv")
+manifest_file = Path("plotting/csv_data/regret.manifest.json")
+log_dir       = Path("logs")
+asset_csv     = Path("inputs/db_files/obz-invest-full-resolution/asset.csv")
 
 # Investment CSV location pattern (same layout as the Julia script)
 investment_csv_pattern = "outputs/{experiment_name}/var_assets_investment.csv"
@@ -131,7 +147,7 @@ if asset_csv.exists():
     asset_capacities = load_asset_capacities(asset_csv)
     print(f"Loaded {len(asset_capacities)} asset capacities from {asset_csv}")
 else:
-    asset_capacities = {}
+    asset_capacities = pd.Series(dtype=float)
     print(f"[WARN] Asset CSV not found at {asset_csv} — investment costs will be 0")
 
 # ── Columns to drop from the raw regret CSVs ─────────────────────────────────
@@ -148,102 +164,166 @@ COLS_TO_DROP = [
     "salvage_value_flows",
 ]
 
-# ── Read and merge regret CSVs ────────────────────────────────────────────────
-csv_files = list(input_dir.glob("*.csv"))
-if not csv_files:
-    print(f"No CSV files found in {input_dir}")
-    exit(1)
+# ── Combine runs into one row per experiment ──────────────────────────────────
+def combine_runs(df: pd.DataFrame, log_index: LogIndex | None, asset_capacities: pd.Series) -> pd.DataFrame:
+    """
+    One row per experiment from its base and ENS runs, enriched with the
+    true operational cost from the logs, the investment costs and the
+    experiment catalog columns.
+    """
+    df = df.drop(columns=["written_at", *CATALOG_COLUMNS], errors="ignore")
+    df = df[["file_name", "calc_ens"] + [c for c in df.columns if c not in ("file_name", "calc_ens")]]
 
-df = pd.concat([pd.read_csv(f) for f in csv_files], ignore_index=True)
+    # Drop unwanted columns (ignore if already absent)
+    df = df.drop(columns=[c for c in COLS_TO_DROP if c in df.columns])
 
-# Keep only the last run per (file_name, calc_ens) — earlier rows are buggy reruns
-df = df.groupby(["file_name", "calc_ens"], sort=False).last().reset_index()
+    # df["calc_ens"] = df["calc_ens"].map({"true": True, "false": False})
 
-# Drop unwanted columns (ignore if already absent)
-df.drop(columns=[c for c in COLS_TO_DROP if c in df.columns], inplace=True)
+    df_base = df[df["calc_ens"] == False].copy()
+    df_ens  = df[df["calc_ens"] == True].copy()
 
-# df["calc_ens"] = df["calc_ens"].map({"true": True, "false": False})
 
-df_base = df[df["calc_ens"] == False].copy()
-df_ens  = df[df["calc_ens"] == True].copy()
+    df_base = df_base.groupby("file_name", sort=False).last().reset_index()
+    df_ens  = df_ens.groupby("file_name", sort=False).last().reset_index()
 
+    ens_only_cols = ["energy_not_served"]
+    merge_keys    = ["method", "num_clusters"]
 
-df_base = df_base.groupby("file_name", sort=False).last().reset_index()
-df_ens  = df_ens.groupby("file_name", sort=False).last().reset_index()
+    # Strip "ens_" prefix so file_name matches the base run
+    df_ens["file_name"] = df_ens["file_name"].str.removeprefix("ens_")
 
-ens_only_cols = ["energy_not_served"]
-merge_keys    = ["method", "num_clusters"]
+    # Keep only the last ENS run per file_name
+    df_ens = df_ens.groupby("file_name", sort=False).last().reset_index()
 
-# Strip "ens_" prefix so file_name matches the base run
-df_ens["file_name"] = df_ens["file_name"].str.removeprefix("ens_")
+    df_base = df_base.drop(columns=["energy_not_served"], errors="ignore")
 
-# Keep only the last ENS run per file_name
-df_ens = df_ens.groupby("file_name", sort=False).last().reset_index()
+    df_merged = df_base.merge(
+        df_ens[["file_name"] + ens_only_cols],
+        on="file_name",
+        how="left",
+    )
 
-df_base = df_base.drop(columns=["energy_not_served"], errors="ignore")
+    df_merged.loc[
+        df_merged["file_name"].str.contains("demandoveravailabilities"),
+        "method"
+    ] = "demandoveravailabilities"
 
-df_merged = df_base.merge(
-    df_ens[["file_name"] + ens_only_cols],
-    on="file_name",
-    how="left",
-)
+    df_merged.loc[
+        df_merged["file_name"].str.contains("utr"),
+        "method"
+    ] = "UTR"
 
-df_merged.loc[
-    df_merged["file_name"].str.contains("demandoveravailabilities"),
-    "method"
-] = "demandoveravailabilities"
+    # --- 4th optimal objective from log ---
+    true_op_costs  = []
 
-df_merged.loc[
-    df_merged["file_name"].str.contains("utr"),
-    "method"
-] = "UTR"
+    for _, row in df_merged.iterrows():
+        exp_name = str(row["file_name"]).strip()
+        # print(f"\nProcessing: {exp_name}")
 
-# ── Enrich with log data and investment costs ─────────────────────────────────
-true_op_costs  = []
-investment_rows = []
+        log_file = find_log_for_experiment(exp_name, log_index) if log_index else None
+        if log_file:
+            val = extract_4th_optimal_objective(log_index.entry(log_file).objectives, log_file)
+            true_op_costs.append(val)
+        else:
+            true_op_costs.append(None)
 
-for _, row in df_merged.iterrows():
-    exp_name = str(row["file_name"]).strip()
-    # print(f"\nProcessing: {exp_name}")
 
-    # --- 4th optimal objective from log ---
-    log_file = find_log_for_experiment(exp_name, log_dir) if log_dir.exists() else None
-    if log_file:
-        val = extract_4th_optimal_objective(log_file)
-        true_op_costs.append(val)
-    else:
-        true_op_costs.append(None)
+    df_merged["true_operational_cost"] = true_op_costs
 
-    # --- Investment costs from var_assets_investment.csv ---
-    inv_csv = Path(investment_csv_pattern.format(experiment_name=exp_name))
-    if inv_csv.exists():
-        inv_data = calculate_investment_costs(inv_csv, asset_capacities)
-    else:
-        print(f"  [WARN] Investment CSV not found: {inv_csv}")
-        inv_data = {
-            "investment_cost": None,
-            "investment_cost_renewables": None,
-            "total_capacity": None,
-            "renewables_capacity": None,
-            **{f"cost_{t}": None for t in sorted(INVESTMENT_COSTS)},
-            **{f"capacity_{t}": None for t in sorted(INVESTMENT_COSTS)},
-        }
-    investment_rows.append(inv_data)
-
-df_merged["true_operational_cost"] = true_op_costs
-
-inv_df = pd.DataFrame(investment_rows)
-df_final = pd.concat([df_merged.reset_index(drop=True), inv_df.reset_index(drop=True)], axis=1)
-
-df_final.loc[df_final["file_name"].str.contains("global", case=False, na=False), "method"] = "NoExtremePreservation Global"
-df_final = df_final.drop_duplicates()
-
-df_final.loc[df_final["num_clusters"] == 8760, "method"] = "base_case"
-df_final.loc[df_final["num_clusters"] == 8760, "file_name"] = (
-    df_final.loc[df_final["num_clusters"] == 8760, "file_name"] + "_base_case"
+    # --- Investment costs from var_assets_investment.csv, all experiments in one groupby ---
+    experiment_names = df_merged["file_name"].astype(str).str.strip()
+    investments = load_investments(experiment_names.unique(), investment_csv_pattern)
+    inv_df = calculate_investment_costs(investments, asset_capacities).reindex(experiment_names)
+    df_final = pd.concat([df_merged.reset_index(drop=True), inv_df.reset_index(drop=True)], axis=1)
+
+    df_final.loc[df_final["file_name"].str.contains("global", case=False, na=False), "method"] = "NoExtremePreservation Global"
+    df_final = df_final.drop_duplicates()
+
+    df_final.loc[df_final["num_clusters"] == 8760, "method"] = "base_case"
+    df_final.loc[df_final["num_clusters"] == 8760, "file_name"] = (
+        df_final.loc[df_final["num_clusters"] == 8760, "file_name"] + "_base_case"
+    )
+
+    # Experiment catalog columns, parsed once here so plots can filter on them
+    return with_catalog(df_final)
+
+
+def experiment_of(file_name: pd.Series) -> pd.Series:
+    """Experiment a combined row belongs to (undoes the "_base_case" relabel)."""
+    return file_name.astype(str).str.removesuffix("_base_case")
+
+
+# ── Inputs and their manifest ─────────────────────────────────────────────────
+# With --incremental only the experiments whose results, log or investment CSV
+# changed since the last run are recomputed and merged into the existing
+# regret.csv. A change to asset.csv or to this script rebuilds everything.
+incremental = "--incremental" in sys.argv[1:]
+
+# Every log is scanned once (cached by size and mtime) instead of once per experiment
+log_index = build_log_index(log_dir) if log_dir.exists() else None
+
+results_paths = result_files(STORE_DIR, input_dir)
+log_paths     = [log_dir / name for name in sorted(log_index.entries)] if log_index else []
+global_paths  = [p for p in (asset_csv, Path(__file__)) if p.exists()]
+results_set   = set(results_paths)
+
+
+def runs_of(path: Path) -> list[str]:
+    if path in results_set:
+        return read_run_names(path)
+    if path.suffix == ".log":
+        return log_index.entry(path).experiments
+    return []
+
+
+previous = Manifest.load(manifest_file)
+manifest, changed = previous.refresh([*global_paths, *results_paths, *log_paths], runs_of)
+
+experiments = {run.removeprefix("ens_") for run in manifest.runs(map(str, results_paths))}
+investment_paths = {Path(investment_csv_pattern.format(experiment_name=name)): name for name in sorted(experiments)}
+investment_paths = {path: name for path, name in investment_paths.items() if path.exists()}
+investments_manifest, changed_investments = previous.refresh(investment_paths, lambda p: [investment_paths[p]])
+
+manifest = Manifest({**manifest.files, **investments_manifest.files})
+changed |= changed_investments
+removed = set(previous.files) - set(manifest.files)
+
+full_rebuild = (
+    not incremental
+    or not output_file.exists()
+    or not previous.files
+    or any(str(p) in changed or str(p) not in previous.files for p in global_paths)
 )
 
+# ── Read runs from the results store (plus the pre-store regret CSVs) ─────────
+# The store keeps only the last run per (file_name, calc_ens) — earlier rows are buggy reruns
+if full_rebuild:
+    df = read_results(legacy_csv_dir=input_dir)
+    if df.empty:
+        print(f"No results found in the results store or {input_dir}")
+        exit(1)
+    df_final = combine_runs(df, log_index, asset_capacities)
+else:
+    affected = {run.removeprefix("ens_") for run in manifest.runs(changed) | previous.runs(removed)}
+    if not affected:
+        manifest.save(manifest_file)
+        print(f"{output_file} is up to date")
+        exit(0)
+
+    wanted = sorted(affected | {f"ens_{name}" for name in affected})
+    legacy = [p for p in results_paths if p.suffix == ".csv" and not affected.isdisjoint(
+        run.removeprefix("ens_") for run in manifest.files[str(p)].runs
+    )]
+    df = read_results(filters=[("file_name", "in", wanted)], legacy_csv_dir=legacy or None)
+
+    existing = pd.read_csv(output_file)
+    kept = existing[~experiment_of(existing["file_name"]).isin(affected)]
+    updated = combine_runs(df, log_index, asset_capacities) if not df.empty else existing.iloc[:0]
+    df_final = pd.concat([kept, updated], ignore_index=True)
+    print(f"Recomputed {len(affected)} experiments with changed inputs")
+
 # ── Save ──────────────────────────────────────────────────────────────────────
 output_file.parent.mkdir(parents=True, exist_ok=True)
 df_final.to_csv(output_file, index=False)
-print(f"\nCombined {len(csv_files)} files → {output_file} ({len(df_final)} rows, {len(df_final.columns)} columns)")
\ No newline at end of file
+manifest.save(manifest_file)
+print(f"\nCombined {len(df)} runs → {output_file} ({len(df_final)} rows, {len(df_final.columns)} columns)")
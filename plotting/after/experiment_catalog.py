@@ -0,0 +1,157 @@
+"""
+Typed experiment catalog: the configuration encoded in every `file_name`.
+
+Python counterpart of `experiment_name` / `get_config_from_experiment_name`
+in cluster/config.jl. A run is named
+
+    [ens_]ward_k<n_prime>_<scope>_<extreme preservation>[_w<tops window>|_s<max block size>]_hp<high>_lp<low>_<dataset>
+
+and combine_regret_data.py appends "_base_case" to the full-resolution rows.
+`parse_experiment_names` parses a whole column with one regex pass over its
+distinct names and returns the typed catalog columns:
+
+    n_prime               int64
+    scope                 category  lowercase clustering method (utr, perlocation, ...)
+    extreme_preservation  category  NoExtremePreservation, Afterwards, ...
+    high_percentile       float64
+    low_percentile        float64
+    tops_window           int64
+    max_block_size        int64
+    dataset               category  basedataset, lowvar, highvar
+    base_case             bool
+
+The results store and regret.csv keep these columns next to each run, and
+`with_catalog` restores their types after a CSV round trip, so scripts can
+filter with masks such as `df["scope"] == "perlocation"` instead of
+scanning `file_name` substrings per row. `experiment_labels` maps these
+columns to the method labels shared by the after-plots.
+"""
+
+import re
+from dataclasses import dataclass
+
+import pandas as pd
+
+SCOPES = pd.CategoricalDtype(
+    ["utr", "perlocation", "perprofile", "demandoveravailabilities", "global", "fullresolution"]
+)
+EXTREME_PRESERVATIONS = pd.CategoricalDtype(
+    ["NoExtremePreservation", "Afterwards", "SeperateExtremesSum", "SeperateTops", "DynamicProgramming"]
+)
+DATASETS = pd.CategoricalDtype(["basedataset", "lowvar", "highvar"])
+
+# Plot label per extreme preservation of the per-location / per-profile runs
+# (UTR runs are always "UTR")
+EXPERIMENT_LABELS = {
+    "NoExtremePreservation": "HC",
+    "SeperateExtremesSum":   "EAC",
+    "Afterwards":            "PEC",
+    # "DynamicProgramming":  "DP",
+}
+PLOTTED_SCOPES = ["perlocation", "perprofile"]
+
+CATALOG_DTYPES = {
+    "n_prime":              "int64",
+    "scope":                SCOPES,
+    "extreme_preservation": EXTREME_PRESERVATIONS,
+    "high_percentile":      "float64",
+    "low_percentile":       "float64",
+    "tops_window":          "int64",
+    "max_block_size":       "int64",
+    "dataset":              DATASETS,
+    "base_case":            "bool",
+}
+CATALOG_COLUMNS = list(CATALOG_DTYPES)
+
+NAME_PATTERN = re.compile(
+    r"^(?:ens_)?ward"
+    r"_k(?P<n_prime>\d+)"
+    r"_(?P<scope>[a-z]+)"
+    r"_(?P<extreme_preservation>[A-Za-z]+)(?:_w(?P<tops_window>\d+)|_s(?P<max_block_size>\d+))?"
+    r"_hp(?P<high_percentile>[\d.]+)"
+    r"_lp(?P<low_percentile>[\d.]+)"
+    r"_(?P<dataset>[a-z]+)"
+    r"(?P<base_case>_base_case)?$"
+)
+
+
+@dataclass(frozen=True)
+class ExperimentConfig:
+    """The fields of `ClusteringConfig` in config.jl that make up an experiment name (same defaults)."""
+    n_prime: int = 8760
+    scope: str = "perlocation"
+    extreme_preservation: str = "NoExtremePreservation"
+    high_percentile: float = 0.95
+    low_percentile: float = 0.05
+    tops_window: int = 5
+    max_block_size: int = 168
+    dataset: str = "basedataset"
+
+
+def experiment_name(config: ExperimentConfig) -> str:
+    if config.extreme_preservation == "SeperateTops":
+        ep_str = f"SeperateTops_w{config.tops_window}"
+    elif config.extreme_preservation == "DynamicProgramming":
+        ep_str = f"DynamicProgramming_s{config.max_block_size}"
+    else:
+        ep_str = config.extreme_preservation
+
+    return "_".join([
+        "ward",
+        f"k{config.n_prime}",
+        config.scope,
+        ep_str,
+        f"hp{round(config.high_percentile, 2)}",
+        f"lp{round(config.low_percentile, 2)}",
+        config.dataset,
+    ])
+
+
+def parse_experiment_names(names: pd.Series) -> pd.DataFrame:
+    """Catalog columns for every name in `names` (same index); each distinct name is parsed once."""
+    codes, unique = pd.factorize(names.astype(str))
+    parts = pd.Series(unique, dtype=object).str.extract(NAME_PATTERN)
+
+    invalid = (
+        parts["n_prime"].isna()
+        | ~parts["scope"].isin(SCOPES.categories)
+        | ~parts["extreme_preservation"].isin(EXTREME_PRESERVATIONS.categories)
+        | ~parts["dataset"].isin(DATASETS.categories)
+    )
+    if invalid.any():
+        raise ValueError(f"Not an experiment name: {', '.join(unique[invalid.to_numpy()][:5])}")
+
+    parts["tops_window"] = parts["tops_window"].fillna("5")
+    parts["max_block_size"] = parts["max_block_size"].fillna("168")
+    parts["base_case"] = parts["base_case"].notna()
+    catalog = parts[CATALOG_COLUMNS].astype(CATALOG_DTYPES)
+
+    catalog = catalog.iloc[codes]
+    catalog.index = names.index
+    return catalog
+
+
+def config_from_experiment_name(name: str) -> ExperimentConfig:
+    row = parse_experiment_names(pd.Series([name])).to_dict("records")[0]
+    return ExperimentConfig(**{f: row[f] for f in ExperimentConfig.__dataclass_fields__})
+
+
+def with_catalog(df: pd.DataFrame, column: str = "file_name") -> pd.DataFrame:
+    """
+    `df` with typed catalog columns. Stored columns (e.g. read back from
+    regret.csv) are only cast; they are parsed from `column` when missing.
+    """
+    stored = [c for c in CATALOG_COLUMNS if c in df.columns]
+    if len(stored) == len(CATALOG_COLUMNS) and df[stored].notna().all().all():
+        return df.astype(CATALOG_DTYPES)
+    catalog = parse_experiment_names(df[column])
+    return df.drop(columns=stored).assign(**{c: catalog[c].array for c in CATALOG_COLUMNS})
+
+
+def experiment_labels(df: pd.DataFrame, scopes=PLOTTED_SCOPES) -> pd.Series:
+    """Plot label per row of a catalog table; NaN for experiments that are not plotted."""
+    labels = df["extreme_preservation"].map(EXPERIMENT_LABELS).astype(object)
+    labels = labels.where(df["scope"].isin(scopes))
+    labels[df["scope"] == "utr"] = "UTR"
+    labels[labels.isna() & df["base_case"]] = "Base case"
+    return labels
@@ -1,24 +1,24 @@
-import pandas as pd
 from pathlib import Path
 
+from experiment_catalog import ExperimentConfig, experiment_name
+from regret_table import load_regret_table
+
 # -----------------------------
 # Settings
 # -----------------------------
 csv_path = Path("plotting/csv_data/regret.csv")
 
-ENS_COST_PER_UNIT = 68887
-
 # -----------------------------
 # Load data
 # -----------------------------
-df = pd.read_csv(csv_path)
+df = load_regret_table(csv_path)
 
 # -----------------------------
 # Runtime baseline
 # (ward_k8760_perlocation_NoExtremePreservation)
 # -----------------------------
 runtime_baseline_row = df[
-    df["file_name"] == "ward_k8760_perlocation_NoExtremePreservation_hp0.95_lp0.05_basedataset_base_case"
+    df["file_name"] == experiment_name(ExperimentConfig(n_prime=8760)) + "_base_case"
 ]
 
 if runtime_baseline_row.empty:
@@ -28,13 +28,9 @@ if runtime_baseline_row.empty:
     )
 
 baseline_runtime = runtime_baseline_row["t_solve"].iloc[0]
-baseline_cost = runtime_baseline_row["true_operational_cost"].iloc[0] + runtime_baseline_row["investment_cost"].iloc[0]
 
-baseline_ens = runtime_baseline_row["energy_not_served"].iloc[0] * ENS_COST_PER_UNIT
-baseline_operational_cost_without_ens = runtime_baseline_row["true_operational_cost"].iloc[0] - baseline_ens
-baseline_total_cost = runtime_baseline_row["investment_cost"].iloc[0] + baseline_ens + baseline_operational_cost_without_ens
-
-assert baseline_total_cost == baseline_cost
+# Relative regret in the regret table is against this same run
+assert (runtime_baseline_row["relative_regret"] == 0).all()
 
 
 # -----------------------------
@@ -43,12 +39,9 @@ assert baseline_total_cost == baseline_cost
 #   - Per-location EAC
 # -----------------------------
 mask = (
-    df["file_name"].str.contains("basedataset", case=False, na=False)
-    & df["file_name"].str.contains(
-        "perlocation_SeperateExtremesSum",
-        case=False,
-        na=False,
-    )
+    (df["dataset"] == "basedataset")
+    & (df["scope"] == "perlocation")
+    & (df["extreme_preservation"] == "SeperateExtremesSum")
 )
 
 eac_df = df[mask].copy()
@@ -57,33 +50,9 @@ if eac_df.empty:
     raise ValueError("No matching rows found.")
 
 # -----------------------------
-# Compute total cost
+# Runtime speedup
+# (relative regret comes precomputed with the regret table)
 # -----------------------------
-eac_df["ens_cost"] = (
-    eac_df["energy_not_served"] * ENS_COST_PER_UNIT
-)
-
-eac_df["operational_cost_without_ens"] = (
-    eac_df["true_operational_cost"]
-    - eac_df["ens_cost"]
-)
-
-eac_df["total_cost"] = (
-    eac_df["investment_cost"]
-    + eac_df["operational_cost_without_ens"]
-    + eac_df["ens_cost"]
-)
-
-
-# -----------------------------
-# Relative regret (%)
-# -----------------------------
-eac_df["relative_regret"] = (
-    (eac_df["total_cost"] - baseline_cost)
-    * 100
-    / baseline_cost
-)
-
 # Speedup relative to base case
 eac_df["runtime_speedup"] = (
     baseline_runtime / eac_df["t_solve"]
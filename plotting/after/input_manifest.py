@@ -0,0 +1,83 @@
+"""
+Manifest of the input files behind plotting/csv_data/regret.csv.
+
+`combine_regret_data.py --incremental` uses it to find which experiments
+need to be recomputed. Every input file (results Parquet files and old
+CSVs, logs, var_assets_investment.csv files, asset.csv) is recorded with
+its size, mtime, SHA-256 and the runs it holds data for:
+
+    {"<path>": {"size": ..., "mtime_ns": ..., "sha256": "...", "runs": ["<file_name>", ...]}}
+
+A file is hashed again only when its size or mtime changed. It counts as
+changed only when its content did, so a touched or copied file whose bytes
+are the same does not trigger any recomputation.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class FileRecord:
+    size: int
+    mtime_ns: int
+    sha256: str
+    runs: list[str] = field(default_factory=list)
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Input file records by path."""
+
+    def __init__(self, files: dict[str, FileRecord] | None = None):
+        self.files = files or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls({name: FileRecord(**record) for name, record in json.loads(path.read_text()).items()})
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        tmp = path.with_name(f".tmp-{path.name}")
+        tmp.write_text(json.dumps({name: vars(record) for name, record in self.files.items()}))
+        tmp.replace(path)
+
+    def refresh(self, paths: Iterable[Path], runs_of: Callable[[Path], list[str]]) -> tuple["Manifest", set[str]]:
+        """
+        Records of `paths` as they are now, and the paths that are new or whose
+        content changed. `runs_of` is only called for those.
+        """
+        files, changed = {}, set()
+        for path in paths:
+            name = str(path)
+            stat = path.stat()
+            old = self.files.get(name)
+            if old is not None and (old.size, old.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                files[name] = old
+                continue
+            sha256 = file_hash(path)
+            if old is not None and old.sha256 == sha256:
+                files[name] = FileRecord(stat.st_size, stat.st_mtime_ns, sha256, old.runs)
+                continue
+            files[name] = FileRecord(stat.st_size, stat.st_mtime_ns, sha256, list(runs_of(path)))
+            changed.add(name)
+        return Manifest(files), changed
+
+    def runs(self, paths: Iterable[str]) -> set[str]:
+        """Runs recorded for any of `paths`."""
+        return {run for p in paths if p in self.files for run in self.files[p].runs}
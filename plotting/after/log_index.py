@@ -0,0 +1,99 @@
+"""
+One-pass index of the experiment logs used by combine_regret_data.py.
+
+Looking up one experiment used to read every log in `logs/` again, so
+combining N runs read all logs N times. `build_log_index` scans each log
+once, on a thread pool (the scan is dominated by reading the files, and
+threads keep it safe to call from top-level plotting scripts), and records:
+
+    experiments  names from "Experiment: <name>" lines
+    objectives   every "Optimal objective" value, in order
+    timings      every "Timings: Dict(...)" line printed by run_experiment.jl
+
+The result is cached in `<log_dir>/.log_index.json`. Each entry is keyed by
+the log's file size and mtime, so a rerun only re-scans logs that changed.
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+CACHE_NAME = ".log_index.json"
+
+EXPERIMENT_PATTERN = re.compile(r"Experiment: (\S+)")
+OBJECTIVE_PATTERN = re.compile(r"Optimal objective\s+([\d.e+\-]+)")
+TIMINGS_PATTERN = re.compile(r"Timings: Dict\((.*)\)")
+TIMING_ENTRY_PATTERN = re.compile(r'"(\w+)"\s*=>\s*([\d.e+\-]+)')
+
+
+@dataclass
+class LogEntry:
+    size: int
+    mtime_ns: int
+    experiments: list[str] = field(default_factory=list)
+    objectives: list[float] = field(default_factory=list)
+    timings: list[dict[str, float]] = field(default_factory=list)
+
+
+def scan_log(path: Path) -> LogEntry:
+    stat = path.stat()
+    text = path.read_text(errors="replace")
+    return LogEntry(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        experiments=list(dict.fromkeys(EXPERIMENT_PATTERN.findall(text))),
+        objectives=[float(v) for v in OBJECTIVE_PATTERN.findall(text)],
+        timings=[
+            {k: float(v) for k, v in TIMING_ENTRY_PATTERN.findall(body)}
+            for body in TIMINGS_PATTERN.findall(text)
+        ],
+    )
+
+
+class LogIndex:
+    """Log entries by file name, plus experiment name → logs (oldest first by name)."""
+
+    def __init__(self, log_dir: Path, entries: dict[str, LogEntry]):
+        self.log_dir = log_dir
+        self.entries = entries
+        self.by_experiment: dict[str, list[str]] = {}
+        for name in sorted(entries):
+            for experiment in entries[name].experiments:
+                self.by_experiment.setdefault(experiment, []).append(name)
+
+    def logs_for(self, experiment_name: str) -> list[Path]:
+        return [self.log_dir / name for name in self.by_experiment.get(experiment_name, [])]
+
+    def entry(self, log_path: Path) -> LogEntry:
+        return self.entries[log_path.name]
+
+
+def build_log_index(log_dir: Path, max_workers: int | None = None) -> LogIndex:
+    """Scan new or changed logs in parallel and refresh the on-disk cache."""
+    log_dir = Path(log_dir)
+    cache_path = log_dir / CACHE_NAME
+    cached = {}
+    if cache_path.exists():
+        cached = {name: LogEntry(**entry) for name, entry in json.loads(cache_path.read_text()).items()}
+
+    entries, stale = {}, []
+    for path in sorted(log_dir.glob("*.log")):
+        stat = path.stat()
+        entry = cached.get(path.name)
+        if entry is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            entries[path.name] = entry
+        else:
+            stale.append(path)
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for path, entry in zip(stale, pool.map(scan_log, stale)):
+                entries[path.name] = entry
+
+    if stale or set(cached) != set(entries):
+        cache_path.write_text(json.dumps({name: vars(entry) for name, entry in entries.items()}))
+        print(f"Indexed {len(stale)} new or changed logs ({len(entries)} total) in {log_dir}")
+
+    return LogIndex(log_dir, entries)
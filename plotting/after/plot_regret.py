@@ -1,8 +1,9 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+from regret_table import load_regret_table
+
 # -----------------------------
 # Settings
 # -----------------------------
@@ -14,8 +15,9 @@ output_dir.mkdir(parents=True, exist_ok=True)
 
 # -----------------------------
 # Load data
+# (cost columns and relative regret come precomputed with the regret table)
 # -----------------------------
-df = pd.read_csv(csv_path)
+df = load_regret_table(csv_path)
 
 df = df[(df["num_clusters"] == 8760) |  (df["num_clusters"] == n_prime)]
 df = df[(df["method"] == "SeperateExtremesSum") |  (df["method"] == "Afterwards") |  (df["method"] == "NoExtremePreservation") |  (df["method"] == "base_case")]
@@ -41,14 +43,6 @@ plt.tight_layout()
 plt.savefig(output_dir / "runtime_per_method.png")
 plt.close()
 
-# -----------------------------
-# Pre-calculate cost columns
-# -----------------------------
-df["ens_cost"] = df["energy_not_served"] * 68887
-df["operational_cost_without_ens"] = df["true_operational_cost"] - df["ens_cost"]
-
-
-
 # -----------------------------
 # Plot 2: regret
 # -----------------------------
@@ -100,11 +94,6 @@ plt.close()
 # -----------------------------
 # Plot 4: relative regret
 # -----------------------------
-df["total_regret"] = df["ens_cost"] + df["operational_cost_without_ens"] + df["investment_cost"]
-baseline_regret = df[df["num_clusters"] == 8760]["total_regret"].values[0]
-
-df["relative_regret"] = (df["total_regret"] - baseline_regret) * 100 / baseline_regret
-
 plt.figure(figsize=(8,5))
 width = 0.5
 x = range(len(df))
@@ -1,7 +1,8 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from regret_table import load_regret_table
+
 # -----------------------------
 # Settings
 # -----------------------------
@@ -9,8 +10,6 @@ csv_path = Path("plotting/csv_data/regret.csv")
 output_dir = Path("plots/regret")
 output_dir.mkdir(parents=True, exist_ok=True)
 
-ENS_COST_PER_UNIT = 68887
-
 DATASET_VARIANTS = ["lowvar", "basedataset", "highvar"]
 DATASET_LABELS = {
     "lowvar": "Low variance",
@@ -24,67 +23,23 @@ HC_COLOR = colors[1]
 EAC_COLOR = colors[3]
 
 # -----------------------------
-# Helpers
+# Per-location HC and EAC runs
 # -----------------------------
-def dataset_from_file_name(file_name):
-    for ds in DATASET_VARIANTS:
-        if ds in file_name:
-            return ds
-    return None
-
-
-def method_from_file_name(file_name):
-    if "perlocation_NoExtremePreservation" in file_name:
-        return "HC"
-    if "perlocation_SeperateExtremesSum" in file_name:
-        return "EAC"
-    return None
-
+METHODS = {
+    "NoExtremePreservation": "HC",
+    "SeperateExtremesSum":   "EAC",
+}
 
 # -----------------------------
 # Load data
+# (total cost and relative regret against each dataset's baseline
+# come precomputed with the regret table)
 # -----------------------------
-df = pd.read_csv(csv_path)
-
-df["dataset"] = df["file_name"].apply(dataset_from_file_name)
-df["method"] = df["file_name"].apply(method_from_file_name)
-
-df = df[
-    df["dataset"].notna()
-    & df["method"].notna()
-]
-
-df["ens_cost"] = df["energy_not_served"] * ENS_COST_PER_UNIT
-df["operational_cost_without_ens"] = (
-    df["true_operational_cost"] - df["ens_cost"]
-)
-df["total_cost"] = (
-    df["investment_cost"]
-    + df["operational_cost_without_ens"]
-    + df["ens_cost"]
-)
-
-# -----------------------------
-# Relative regret
-# -----------------------------
-records = []
-
-for dataset, grp in df.groupby("dataset"):
-    baseline = grp.loc[
-        grp["num_clusters"].idxmax(),
-        "total_cost"
-    ]
-
-    tmp = grp.copy()
-    tmp["relative_regret"] = (
-        (tmp["total_cost"] - baseline)
-        / baseline
-        * 100
-    )
+df = load_regret_table(csv_path)
 
-    records.append(tmp)
+df["method"] = df["extreme_preservation"].map(METHODS).astype(object).where(df["scope"] == "perlocation")
 
-df = pd.concat(records, ignore_index=True)
+df = df[df["method"].notna()]
 
 # Remove baseline row
 df = df[df["num_clusters"] != 8760]
@@ -2,7 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 from pathlib import Path
-import re
+
+from experiment_catalog import experiment_labels
+from regret_table import load_regret_table
 
 # -----------------------------
 # Settings
@@ -13,26 +15,6 @@ output_dir.mkdir(parents=True, exist_ok=True)
 
 results_csv_path = Path("plots/regret/regret_results_summary.csv")
 
-ENS_COST_PER_UNIT = 68887
-
-# -----------------------------
-# Experiment label mapping
-# Key: substring matched against file_name (checked in order)
-# Value: label shown in the plot
-# -----------------------------
-EXPERIMENT_LABELS = {
-    "utr":                               "UTR",
-    "perlocation_NoExtremePreservation": "HC",
-    "perprofile_NoExtremePreservation":  "HC",
-    "perlocation_SeperateExtremesSum":   "EAC",
-    "perprofile_SeperateExtremesSum":    "EAC",
-    "perlocation_Afterwards":            "PEC",
-    "perprofile_Afterwards":             "PEC",
-    # "perlocation_DynamicProgramming_s168": "DP",
-    # "perlocation_DynamicProgramming_s168":  "DP",
-    "base_case":                         "Base case",
-}
-
 LEGEND_ORDER = ["UTR", "HC", "PEC", "EAC", "DP"]
 
 DATASET_VARIANTS = ["basedataset", "lowvar", "highvar"]
@@ -44,72 +26,16 @@ SCOPE_LABELS = {"perlocation": "Per location", "perprofile": "Per profile"}
 # Methods to show faded/alpha on log panel
 METHODS_FADED = {}
 
-# -----------------------------
-# Parsing helpers
-# -----------------------------
-def label_from_file_name(file_name: str) -> str:
-    for key, label in EXPERIMENT_LABELS.items():
-        if key in file_name:
-            return label
-    return file_name
-
-
-def scope_from_file_name(file_name: str) -> str | None:
-    if "perlocation" in file_name:
-        return "perlocation"
-    if "perprofile" in file_name:
-        return "perprofile"
-    if "utr" in file_name:
-        return "utr"   # UTR goes into both scopes (same data)
-    return None
-
-
-def dataset_from_file_name(file_name: str) -> str | None:
-    for ds in DATASET_VARIANTS:
-        if ds in file_name:
-            return ds
-    return None
-
-
 # -----------------------------
 # Load & prepare data
 # -----------------------------
-df = pd.read_csv(csv_path)
-
-df["label"]   = df["file_name"].apply(label_from_file_name)
-df["scope"]   = df["file_name"].apply(scope_from_file_name)
-df["dataset"] = df["file_name"].apply(dataset_from_file_name)
+df = load_regret_table(csv_path)
+df["label"] = experiment_labels(df, SCOPES)
 
 # Keep only rows with a known label
-known_labels = set(EXPERIMENT_LABELS.values())
-df = df[df["label"].isin(known_labels)]
-
-df["ens_cost"] = df["energy_not_served"] * ENS_COST_PER_UNIT
-df["operational_cost_without_ens"] = df["true_operational_cost"] - df["ens_cost"]
-df["total_cost"] = df["ens_cost"] + df["operational_cost_without_ens"] + df["investment_cost"]
-
-# -----------------------------
-# Compute baseline per dataset
-# (num_clusters == 8760, or fallback: max clusters)
-# -----------------------------
-def get_baseline(sub_df: pd.DataFrame) -> float:
-    bl = sub_df[sub_df["num_clusters"] == 8760]
-    if len(bl) == 1:
-        return bl["total_cost"].values[0]
-    # fallback: largest cluster count
-    idx = sub_df["num_clusters"].idxmax()
-    return sub_df.loc[idx, "total_cost"]
-
-
-# Compute relative regret within each (dataset) group using its own baseline
-records = []
-for dataset, grp in df.groupby("dataset"):
-    baseline_value = get_baseline(grp)
-    grp = grp.copy()
-    grp["relative_regret"] = (grp["total_cost"] - baseline_value) * 100 / baseline_value
-    records.append(grp)
-
-df = pd.concat(records, ignore_index=True)
+# (ens_cost, total_cost and relative_regret against each dataset's own
+# baseline come precomputed with the regret table)
+df = df[df["label"].notna()]
 
 # UTR rows: duplicate into both scopes so they appear in every plot
 utr_rows = df[df["scope"] == "utr"].copy()
@@ -213,6 +139,7 @@ if "runtime" in plot_df.columns:
 summary = (
     plot_df[export_cols]
     .rename(columns={"label": "method"})
+    .astype({"scope": str, "dataset": str})
     .sort_values(["scope", "dataset", "method", "num_clusters"])
     .reset_index(drop=True)
 )
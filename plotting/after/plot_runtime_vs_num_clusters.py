@@ -2,6 +2,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from experiment_catalog import experiment_labels, with_catalog
+
 # -----------------------------
 # Settings
 # -----------------------------
@@ -9,22 +11,6 @@ csv_path = Path("plotting/csv_data/regret.csv")
 output_dir = Path("plots/runtime")
 output_dir.mkdir(parents=True, exist_ok=True)
 
-# -----------------------------
-# Experiment label mapping
-# -----------------------------
-EXPERIMENT_LABELS = {
-    "utr":                               "UTR",
-    "perlocation_NoExtremePreservation": "HC",
-    "perprofile_NoExtremePreservation":  "HC",
-    "perlocation_SeperateExtremesSum":   "EAC",
-    "perprofile_SeperateExtremesSum":    "EAC",
-    "perlocation_Afterwards":            "PEC",
-    "perprofile_Afterwards":             "PEC",
-    # "perlocation_DynamicProgramming_s168": "DP",
-    # "perprofile_DynamicProgramming_s168":  "DP",
-    "base_case":                         "Base case",
-}
-
 LEGEND_ORDER = ["UTR", "HC", "PEC", "EAC", "DP"]
 
 DATASET_VARIANTS = ["basedataset", "lowvar", "highvar"]
@@ -40,45 +26,14 @@ SCOPE_LABELS = {
     "perprofile": "Per profile",
 }
 
-# -----------------------------
-# Parsing helpers
-# -----------------------------
-def label_from_file_name(file_name: str) -> str:
-    for key, label in EXPERIMENT_LABELS.items():
-        if key in file_name:
-            return label
-    return file_name
-
-
-def scope_from_file_name(file_name: str):
-    if "perlocation" in file_name:
-        return "perlocation"
-    if "perprofile" in file_name:
-        return "perprofile"
-    if "utr" in file_name:
-        return "utr"
-    return None
-
-
-def dataset_from_file_name(file_name: str):
-    for ds in DATASET_VARIANTS:
-        if ds in file_name:
-            return ds
-    return None
-
-
 # -----------------------------
 # Load data
 # -----------------------------
-df = pd.read_csv(csv_path)
-
-df["label"] = df["file_name"].apply(label_from_file_name)
-df["scope"] = df["file_name"].apply(scope_from_file_name)
-df["dataset"] = df["file_name"].apply(dataset_from_file_name)
+df = with_catalog(pd.read_csv(csv_path))
+df["label"] = experiment_labels(df, SCOPES)
 
 # Keep only known experiments
-known_labels = set(EXPERIMENT_LABELS.values())
-df = df[df["label"].isin(known_labels)].copy()
+df = df[df["label"].notna()].copy()
 
 df["runtime"] = df["t_solve"]
 
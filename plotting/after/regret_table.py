@@ -0,0 +1,74 @@
+"""
+Materialized regret table shared by the after-plots.
+
+`load_regret_table` returns regret.csv with the experiment catalog columns
+(see experiment_catalog.py) and the derived cost columns:
+
+    ens_cost                      energy_not_served * ENS_COST_PER_UNIT
+    operational_cost_without_ens  true_operational_cost - ens_cost
+    total_cost                    ens_cost + operational_cost_without_ens + investment_cost
+    baseline_total_cost           total_cost of the dataset's baseline run
+    relative_regret               (total_cost - baseline_total_cost) * 100 / baseline_total_cost
+    runtime                       t_solve
+
+The baseline of a dataset is its full-resolution run: the first row with the
+largest `num_clusters` (8760 for the base case).
+
+The table is computed once per version of regret.csv and cached as
+`<CACHE_DIR>/<key>.parquet`, where the key hashes regret.csv and this module.
+Any later load only hashes the CSV and reads the Parquet file.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from experiment_catalog import with_catalog
+
+ENS_COST_PER_UNIT = 68887
+
+CSV_PATH = Path("plotting/csv_data/regret.csv")
+CACHE_DIR = Path("plotting/csv_data/regret_table")
+
+
+def add_regret_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Derived cost, baseline and relative regret columns for every row at once."""
+    df = df.assign(ens_cost=df["energy_not_served"] * ENS_COST_PER_UNIT)
+    df["operational_cost_without_ens"] = df["true_operational_cost"] - df["ens_cost"]
+    df["total_cost"] = df["ens_cost"] + df["operational_cost_without_ens"] + df["investment_cost"]
+
+    baselines = (
+        df.sort_values("num_clusters", ascending=False, kind="stable")
+        .drop_duplicates("dataset")
+        .set_index("dataset")["total_cost"]
+    )
+    df["baseline_total_cost"] = df["dataset"].map(baselines).astype(float)
+    df["relative_regret"] = (df["total_cost"] - df["baseline_total_cost"]) * 100 / df["baseline_total_cost"]
+    df["runtime"] = df["t_solve"]
+    return df
+
+
+def table_key(csv_path: Path) -> str:
+    digest = hashlib.sha256(Path(csv_path).read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def load_regret_table(csv_path: Path = CSV_PATH, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """The regret table of `csv_path`, from the cache when it is up to date."""
+    cache = Path(cache_dir) / f"{table_key(csv_path)}.parquet"
+    if cache.exists():
+        return pd.read_parquet(cache)
+
+    df = add_regret_columns(with_catalog(pd.read_csv(csv_path)))
+
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_name(f".tmp-{cache.name}")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, cache)
+    for old in cache.parent.glob("*.parquet"):
+        if old != cache and not old.name.startswith(".tmp-"):
+            old.unlink()
+    return df
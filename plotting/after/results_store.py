@@ -0,0 +1,211 @@
+"""
+Columnar store for the per-run experiment results (one row per solved model).
+
+`run_experiment.jl` used to read the whole per-experiment regret CSV, append
+one row and rewrite the file after every run. `combine_regret_data.py` then
+concatenated every CSV and deduplicated reruns. Here a run instead writes
+one immutable Parquet fragment, and fragments are periodically compacted
+into a Hive-partitioned dataset:
+
+    plotting/csv_data/results/
+        fragments/<file_name>_<unix µs>_<pid>.parquet
+        dataset/dataset=<dataset>/scope=<scope>/method=<method>/part-<unix µs>.parquet
+
+Writing a fragment is O(1) and never touches another file, so concurrent
+sweep jobs cannot race. Compaction only rewrites the partitions that
+received new fragments, and stores the experiment catalog columns
+(n_prime, extreme_preservation, percentiles, ..., see experiment_catalog.py)
+with every row. `read_results` pushes filters on any column (including
+dataset/scope/method and the catalog columns) down to the Parquet reader.
+It returns the latest row per (file_name, calc_ens), ordered by `written_at`.
+
+Rows written before the store existed live in plotting/csv_data/regret/*.csv.
+Pass that directory as `legacy_csv_dir`, or migrate it once with
+
+    python plotting/after/results_store.py import-csv plotting/csv_data/regret
+    python plotting/after/results_store.py compact
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from experiment_catalog import CATALOG_COLUMNS, CATALOG_DTYPES, parse_experiment_names
+
+STORE_DIR = Path("plotting/csv_data/results")
+PARTITION_KEYS = ["dataset", "scope", "method"]
+RUN_KEYS = ["file_name", "calc_ens"]
+CATEGORICAL = [c for c, dtype in CATALOG_DTYPES.items() if isinstance(dtype, pd.CategoricalDtype)]
+
+
+def _with_partition_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with the experiment catalog columns (stored as plain values) and `method`."""
+    missing = [c for c in CATALOG_COLUMNS if c not in df.columns or df[c].isna().any()]
+    if missing:
+        catalog = parse_experiment_names(df["file_name"])
+        df = df.assign(**{c: catalog[c].astype(str) if c in CATEGORICAL else catalog[c] for c in missing})
+    if "method" not in df.columns:
+        df = df.assign(method=df["extreme_preservation"])
+    return df
+
+
+def _latest(df: pd.DataFrame) -> pd.DataFrame:
+    """Last written row per run; earlier rows are superseded reruns."""
+    df = df.sort_values("written_at", kind="stable")
+    return df.drop_duplicates(RUN_KEYS, keep="last").reset_index(drop=True)
+
+
+def _stamp() -> str:
+    return f"{int(time.time() * 1e6)}_{os.getpid()}"
+
+
+def _write_atomic(table: pa.Table, path: Path) -> None:
+    tmp = path.with_name(f".tmp-{path.name}")
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
+# =========================
+# Writing
+# =========================
+
+def write_fragment(rows: pd.DataFrame, store: Path = STORE_DIR) -> Path:
+    """Write the rows of one run as a new immutable fragment."""
+    rows = _with_partition_columns(rows)
+    if "written_at" not in rows:
+        rows = rows.assign(written_at=time.time())
+    fragments = store / "fragments"
+    fragments.mkdir(parents=True, exist_ok=True)
+    path = fragments / f"{rows['file_name'].iloc[0]}_{_stamp()}.parquet"
+    _write_atomic(pa.Table.from_pandas(rows, preserve_index=False), path)
+    return path
+
+
+def _legacy_paths(legacy) -> list[Path]:
+    """The old CSVs: every CSV in a directory, or an explicit list of files."""
+    if isinstance(legacy, (str, Path)):
+        return sorted(Path(legacy).glob("*.csv"))
+    return sorted(Path(p) for p in legacy)
+
+
+def read_legacy_csvs(csv_dir) -> pd.DataFrame:
+    """Rows of the old per-experiment CSVs; `written_at` follows file mtime and row order."""
+    frames = []
+    for csv in _legacy_paths(csv_dir):
+        df = pd.read_csv(csv)
+        frames.append(df.assign(written_at=csv.stat().st_mtime + 1e-6 * pd.RangeIndex(len(df))))
+    if not frames:
+        return pd.DataFrame(columns=RUN_KEYS + ["written_at"])
+    return _with_partition_columns(pd.concat(frames, ignore_index=True))
+
+
+def import_legacy_csvs(csv_dir: Path, store: Path = STORE_DIR) -> int:
+    """Turn every old CSV into one fragment; returns the number of rows imported."""
+    df = read_legacy_csvs(csv_dir)
+    for _, rows in df.groupby("file_name", sort=False):
+        write_fragment(rows, store)
+    return len(df)
+
+
+def compact(store: Path = STORE_DIR) -> int:
+    """Fold all fragments into the partitioned dataset; returns the number of fragments folded."""
+    paths = sorted((store / "fragments").glob("*.parquet"))
+    if not paths:
+        return 0
+    new = pd.concat([pq.read_table(p).to_pandas() for p in paths], ignore_index=True)
+
+    for key, rows in _with_partition_columns(new).groupby(PARTITION_KEYS):
+        directory = store / "dataset" / "/".join(f"{k}={v}" for k, v in zip(PARTITION_KEYS, key))
+        directory.mkdir(parents=True, exist_ok=True)
+        old_files = sorted(directory.glob("*.parquet"))
+        old = [pq.read_table(f).to_pandas() for f in old_files]
+
+        merged = _latest(pd.concat([*old, rows.drop(columns=PARTITION_KEYS)], ignore_index=True))
+        _write_atomic(pa.Table.from_pandas(merged, preserve_index=False), directory / f"part-{_stamp()}.parquet")
+        for f in old_files:
+            f.unlink()
+
+    for p in paths:
+        p.unlink()
+    return len(paths)
+
+
+# =========================
+# Reading
+# =========================
+
+def result_files(store: Path = STORE_DIR, legacy_csv_dir=None) -> list[Path]:
+    """Every file `read_results` reads: compacted parts, pending fragments and the old CSVs."""
+    paths = sorted((store / "dataset").glob("**/*.parquet")) + sorted((store / "fragments").glob("*.parquet"))
+    paths = [p for p in paths if not p.name.startswith(".tmp-")]
+    return paths + (_legacy_paths(legacy_csv_dir) if legacy_csv_dir is not None else [])
+
+
+def read_run_names(path: Path) -> list[str]:
+    """Distinct `file_name`s stored in one result file (Parquet or old CSV)."""
+    path = Path(path)
+    if path.suffix == ".csv":
+        names = pd.read_csv(path, usecols=["file_name"])["file_name"]
+    else:
+        names = pq.read_table(path, columns=["file_name"]).column("file_name").to_pandas()
+    return names.astype(str).unique().tolist()
+
+
+def _as_expression(filters):
+    if filters is None or isinstance(filters, pc.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+
+def read_results(
+    filters=None,
+    columns: list[str] | None = None,
+    store: Path = STORE_DIR,
+    legacy_csv_dir=None,
+) -> pd.DataFrame:
+    """
+    Latest row per (file_name, calc_ens) from the compacted dataset, pending
+    fragments and optionally the old CSVs (a directory or a list of files).
+
+    `filters` is a pyarrow expression or a DNF list as accepted by
+    `pd.read_parquet`, e.g. `[("dataset", "==", "basedataset"), ("num_clusters", "<", 2000)]`.
+    """
+    expression = _as_expression(filters)
+    wanted = None if columns is None else list(dict.fromkeys([*RUN_KEYS, "written_at", *columns]))
+    tables = []
+
+    dataset_dir = store / "dataset"
+    if dataset_dir.exists():
+        compacted = ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+        tables.append(compacted.to_table(columns=wanted, filter=expression))
+
+    for path in sorted((store / "fragments").glob("*.parquet")):
+        tables.append(pq.read_table(path, columns=wanted, filters=expression))
+
+    if legacy_csv_dir is not None:
+        legacy = pa.Table.from_pandas(read_legacy_csvs(legacy_csv_dir), preserve_index=False)
+        if expression is not None:
+            legacy = legacy.filter(expression)
+        tables.append(legacy.select(wanted) if wanted else legacy)
+
+    if not tables:
+        return pd.DataFrame(columns=wanted or RUN_KEYS)
+    table = pa.concat_tables(tables, promote_options="permissive")
+    return _latest(table.to_pandas())
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "compact"
+    if command == "import-csv":
+        print(f"Imported {import_legacy_csvs(Path(sys.argv[2]))} rows")
+    elif command == "compact":
+        print(f"Compacted {compact()} fragments into {STORE_DIR / 'dataset'}")
+    else:
+        raise SystemExit(f"Unknown command: {command} (expected import-csv or compact)")
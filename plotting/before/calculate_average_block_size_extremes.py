@@ -1,9 +1,11 @@
 import pandas as pd
 import numpy as np
 
+from cluster.partition_store import load_partitions
+
 INPUT_PATH = "inputs/db_files/ward_k4000_perlocation_NoExtremePreservation_hp0.95_lp0.05/"
-partitions_path = f"{INPUT_PATH}assets-rep-periods-partitions.csv"
-df = pd.read_csv(partitions_path)
+partitions = load_partitions(INPUT_PATH)
+df = partitions.table
 
 mask = (df["asset"] == "NL_E_Demand") & (df["specification"] == "explicit")
 df_filtered = df[mask]
@@ -19,25 +21,21 @@ else:
     values = df_values["value"].values
 
     threshold = np.percentile(values, 95)
-    top_timesteps = set(np.where(values >= threshold)[0])  # 0-indexed
-
-    results = []
-
-    for _, row in df_filtered.iterrows():
-        sizes = [int(x) for x in str(row["partition"]).split(";")]
-
-        idx = 0
-        for size in sizes:
-            block_timesteps = set(range(idx, idx + size))
-            if block_timesteps & top_timesteps:  # block contains at least one top-5% timestep
-                results.append({
-                    "rep_period": row["rep_period"],
-                    "year": row["year"],
-                    "block_size": size,
-                })
-            idx += size
-
-    df_results = pd.DataFrame(results)
+    top_count = np.concatenate([[0], np.cumsum(values >= threshold)])  # top-5% timesteps before t
+
+    # Block start/end timesteps within their own row
+    sizes, offsets = partitions.rows(mask)
+    row_of_block = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    ends = np.cumsum(sizes) - np.concatenate([[0], np.cumsum(sizes)])[offsets[:-1]][row_of_block]
+    starts = ends - sizes
+
+    # block contains at least one top-5% timestep
+    hit = top_count[np.minimum(ends, len(values))] > top_count[np.minimum(starts, len(values))]
+    df_results = pd.DataFrame({
+        "rep_period": df_filtered["rep_period"].to_numpy()[row_of_block[hit]],
+        "year": df_filtered["year"].to_numpy()[row_of_block[hit]],
+        "block_size": sizes[hit],
+    })
 
     print(f"95th percentile threshold: {threshold:.4f}")
     print(f"Blocks containing a top-5% timestep: {len(df_results)}")
@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from cluster.partition_store import parse_semicolon_column, take_rows
+
 num_clusters = 1000
 extreme_preservation = True
 Path("plots/load_duration_curve").mkdir(parents=True, exist_ok=True)
@@ -16,21 +18,12 @@ df_full_resolution = pd.read_csv(f"plotting/csv_data/partitions/8760.csv")
 df = df[df["location"] == "NL"]
 df_full_resolution = df_full_resolution[df_full_resolution["location"] == "NL"]
 
-# --- Parsing helper ---
-def parse_semicolon_string(val_string, dtype=float):
-    if pd.isna(val_string):
-        return []
-    val_string = val_string.strip().lstrip(",")
-    return [dtype(v) for v in val_string.split(";") if v != ""]
-
-# Parse clustered data
-df["parsed_values"] = df["values"].apply(lambda x: parse_semicolon_string(x, float))
-df["parsed_partitions"] = df["partition"].apply(lambda x: parse_semicolon_string(x, int))
+# Parse clustered data (CSR: row i is flat[offsets[i]:offsets[i + 1]])
+values, value_offsets = parse_semicolon_column(df["values"], np.float64)
+partitions, partition_offsets = parse_semicolon_column(df["partition"], np.int64)
 
 # Parse full resolution data
-df_full_resolution["parsed_values"] = df_full_resolution["values"].apply(
-    lambda x: parse_semicolon_string(x, float)
-)
+full_resolution_values, full_resolution_offsets = parse_semicolon_column(df_full_resolution["values"], np.float64)
 
 # --- Get assets ---
 assets = df["asset"].unique()
@@ -48,34 +41,26 @@ for i, asset in enumerate(assets):
     # -------------------------
     # Clustered (weighted) data
     # -------------------------
-    clustered_values = []
-    
-    asset_df = df[df["asset"] == asset]
-    
-    for vals, parts in zip(asset_df["parsed_values"], asset_df["parsed_partitions"]):
-        if len(vals) != len(parts):
-            raise ValueError(f"Mismatch in values and partitions length for asset {asset}")
-        
-        # Expand according to partition size
-        expanded = np.repeat(vals, parts)
-        clustered_values.extend(expanded)
-    
+    rows = (df["asset"] == asset).to_numpy()
+    vals, vals_offsets = take_rows(values, value_offsets, rows)
+    parts, parts_offsets = take_rows(partitions, partition_offsets, rows)
+
+    if not np.array_equal(vals_offsets, parts_offsets):
+        raise ValueError(f"Mismatch in values and partitions length for asset {asset}")
+
+    # Expand according to partition size
+    clustered_values = np.repeat(vals, parts)
+
     # -------------------------
     # Full resolution data
     # -------------------------
-    full_values = []
-    
-    asset_full_df = df_full_resolution[df_full_resolution["asset"] == asset]
-    
-    for vals in asset_full_df["parsed_values"]:
-        full_values.extend(vals)
-    
+    full_values, _ = take_rows(
+        full_resolution_values, full_resolution_offsets, (df_full_resolution["asset"] == asset).to_numpy()
+    )
+
     if len(clustered_values) == 0 or len(full_values) == 0:
         continue
     
-    clustered_values = np.array(clustered_values)
-    full_values = np.array(full_values)
-    
     # Sort descending (Load Duration Curve)
     clustered_sorted = np.sort(clustered_values)[::-1]
     full_sorted = np.sort(full_values)[::-1]
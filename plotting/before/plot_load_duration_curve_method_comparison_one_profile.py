@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from cluster.partition_store import parse_semicolon_column, valid_semicolon_rows
+
 num_clusters = 1000
 Path("plots/load_duration_curve").mkdir(parents=True, exist_ok=True)
 
@@ -13,18 +15,6 @@ files = {
     "AEC": "ward_k1000_perlocation_SeperateExtremesSum_hp0.95_lp0.05",
 }
 
-# --- Parsing helper ---
-def parse_semicolon_string(val_string, dtype=float):
-    if pd.isna(val_string):
-        return []
-    try:
-        val_string = str(val_string).strip().lstrip(",")
-        return [dtype(v) for v in val_string.split(";") if v != ""]
-    except Exception as e:
-        print(f"[ERROR] Failed parsing string: {val_string}")
-        print(f"        Exception: {e}")
-        return []
-
 # --- Load full resolution ---
 try:
     print("[INFO] Loading full resolution data (8760)...")
@@ -39,24 +29,20 @@ if not required_cols.issubset(df_full_resolution.columns):
 df_full_resolution = df_full_resolution[df_full_resolution["location"] == "NL"]
 print(f"[INFO] Full resolution rows after NL filter: {len(df_full_resolution)}")
 
-df_full_resolution["parsed_values"] = df_full_resolution["values"].apply(
-    lambda x: parse_semicolon_string(x, float)
-)
-
 # --- Extract full resolution demand ---
-full_values = []
 df_full_demand = df_full_resolution[df_full_resolution["asset"] == "NL_E_Demand"]
 
 if df_full_demand.empty:
     raise ValueError("[FATAL] No demand data found in full resolution dataset!")
 
-for vals in df_full_demand["parsed_values"]:
-    full_values.extend(vals)
+full_valid = valid_semicolon_rows(df_full_demand["values"], np.float64)
+for idx in np.flatnonzero(~full_valid):
+    print(f"[ERROR] Failed parsing full resolution values at row {idx} -> skipping row")
+full_values, _ = parse_semicolon_column(df_full_demand["values"][full_valid], np.float64)
 
 if len(full_values) == 0:
     raise ValueError("[FATAL] Full resolution demand values are empty!")
 
-full_values = np.array(full_values)
 full_sorted = np.sort(full_values)[::-1]
 
 print(f"[DEBUG] Full resolution demand:")
@@ -97,28 +83,29 @@ for ax, (label, filename) in zip(axes, files.items()):
         print(f"[WARNING] No demand data for {label} -> skipping")
         continue
 
-    df["parsed_values"] = df["values"].apply(lambda x: parse_semicolon_string(x, float))
-    df["parsed_partitions"] = df["partition"].apply(lambda x: parse_semicolon_string(x, int))
-
-    # --- Expand clustered values ---
-    clustered_values = []
+    # Malformed rows are dropped one by one; the rest of the experiment is still plotted
+    parsable = valid_semicolon_rows(df["values"], np.float64) & valid_semicolon_rows(df["partition"], np.int64)
+    for idx in np.flatnonzero(~parsable):
+        print(f"[ERROR] Failed parsing row {idx} of {filename} -> skipping row")
+    df = df[parsable]
 
-    for idx, (vals, parts) in enumerate(zip(df["parsed_values"], df["parsed_partitions"])):
-        if len(vals) != len(parts):
-            print(f"[WARNING] Length mismatch at row {idx}: values={len(vals)}, partitions={len(parts)} -> skipping row")
-            continue
+    vals, vals_offsets = parse_semicolon_column(df["values"], np.float64)
+    parts, parts_offsets = parse_semicolon_column(df["partition"], np.int64)
 
-        try:
-            expanded = np.repeat(vals, parts)
-            clustered_values.extend(expanded)
-        except Exception as e:
-            print(f"[ERROR] Failed expanding row {idx}: {e}")
+    # --- Expand clustered values ---
+    value_counts = np.diff(vals_offsets)
+    partition_counts = np.diff(parts_offsets)
+    for idx in np.flatnonzero(value_counts != partition_counts):
+        print(f"[WARNING] Length mismatch at row {idx}: values={value_counts[idx]}, "
+              f"partitions={partition_counts[idx]} -> skipping row")
+    valid = np.repeat(value_counts == partition_counts, value_counts)
+    valid_parts = np.repeat(value_counts == partition_counts, partition_counts)
+    clustered_values = np.repeat(vals[valid], parts[valid_parts])
 
     if len(clustered_values) == 0:
         print(f"[WARNING] No valid clustered values for {label}")
         continue
 
-    clustered_values = np.array(clustered_values)
     clustered_sorted = np.sort(clustered_values)[::-1]
 
     print(f"[DEBUG] Clustered ({label}):")
@@ -1,26 +1,24 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 from collections import Counter
 
+from cluster.partition_store import load_partitions
+
 PROFILE = "NL_E_Demand"
 FILE_NAME = "ward_k4000_perlocation_NoExtremePreservation_hp0.95_lp0.05"
 # --- Load ---
-path = f"inputs/db_files/{FILE_NAME}/assets-rep-periods-partitions.csv"
-df = pd.read_csv(path)
+partitions = load_partitions(f"inputs/db_files/{FILE_NAME}")
+df = partitions.table
 
 
 # --- Filter ---
 mask = (df["asset"] == PROFILE) & (df["specification"] == "explicit")
-df_filtered = df[mask]
 
-if df_filtered.empty:
+if not mask.any():
     print(f"No explicit rows found for {PROFILE}")
 else:
     # --- Parse all partitions across all matching rows ---
-    all_sizes = []
-    for _, row in df_filtered.iterrows():
-        sizes = [int(x) for x in str(row["partition"]).split(";")]
-        all_sizes.extend(sizes)
+    all_sizes, _ = partitions.rows(mask)
+    all_sizes = all_sizes.tolist()
 
     counts = Counter(all_sizes)
     print(f"Total partitions: {len(all_sizes)}")
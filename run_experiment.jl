@@ -16,7 +16,22 @@ include("create_ens_experiment_db.jl")
 
 config = @isdefined(CONFIG) ? CONFIG : ClusteringConfig()
 println("Using config: ", config)
-const RESULTS_CSV = "plotting/csv_data/regret/v2_$(experiment_name(config)).csv"
+# One immutable Parquet fragment per run; compacted by plotting/after/results_store.py
+const RESULTS_FRAGMENTS = "plotting/csv_data/results/fragments"
+
+function write_results_fragment(df_row::DataFrame, file_name::String)
+    mkpath(RESULTS_FRAGMENTS)
+    path = joinpath(RESULTS_FRAGMENTS, "$(file_name)_$(round(Int, time() * 1e6))_$(getpid()).parquet")
+    tmp = joinpath(RESULTS_FRAGMENTS, ".tmp-$(basename(path))")
+
+    conn = DBInterface.connect(DuckDB.DB)
+    DuckDB.register_data_frame(conn, df_row, "fragment")
+    DBInterface.execute(conn, "COPY fragment TO '$tmp' (FORMAT PARQUET)")
+    DBInterface.close!(conn)
+
+    mv(tmp, path)
+    return path
+end
 
 function create_cluster_partitions_for_experiment(connection, config)
     if config.clustering_method == UTR
@@ -138,7 +153,7 @@ function run_experiment(config, calc_ens::Bool; base_energy_problem = nothing, b
         energy_not_served = isempty(flow_ens) ? 0.0 : sum(flow_ens.solution)
     end
 
-    # 7. Append to results CSV
+    # 7. Write results fragment
     df_row = DataFrame(
         vcat(
             [
@@ -154,20 +169,15 @@ function run_experiment(config, calc_ens::Bool; base_energy_problem = nothing, b
             [Symbol(sym, :_flows)  => costs_flows[sym]  for sym in cost_cols_flows],
             [
                 :energy_not_served => energy_not_served,
+                :dataset           => lowercase(string(config.dataset)),
+                :scope             => lowercase(string(config.clustering_method)),
+                :written_at        => time(),
             ]
         )
     )
 
-    if isfile(RESULTS_CSV)
-        df_existing = CSV.read(RESULTS_CSV, DataFrame)
-        df_out = vcat(df_existing, df_row; cols = :union)
-    else
-        mkpath(dirname(RESULTS_CSV))
-        df_out = df_row
-    end
-
-    CSV.write(RESULTS_CSV, df_out)
-    println("Results written to $RESULTS_CSV")
+    results_path = write_results_fragment(df_row, file_name)
+    println("Results written to $results_path")
     println("Timings: ", timings)
     println("Done: $file_name")
 
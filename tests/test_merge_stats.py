@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from cluster import ClusteringConfig, ExtremePreservation, ProfileType
+from cluster.cluster_ward import hierarchical_time_clustering_ward, ward_merge_log
+
+
+def recomputed_errors(log):
+    """SSE and LDC RMSE per column before every merge, rebuilt from the clustering at that step."""
+    n = log.n
+    full_desc = -np.sort(-log.values, axis=0)
+    ward, ldc = [], []
+    for step in range(len(log.right)):
+        partitions, _, mean_values = log.cut(n - step)
+        merged = np.repeat(mean_values, partitions, axis=0)
+        ward.append(np.sum((log.values - merged) ** 2, axis=0))
+        ldc.append(np.sqrt(np.mean((full_desc - -np.sort(-merged, axis=0)) ** 2, axis=0)))
+    return np.array(ward), np.array(ldc)
+
+
+@pytest.mark.parametrize("extreme_preservation", [
+    ExtremePreservation.NO_EXTREME_PRESERVATION,
+    ExtremePreservation.SEPERATE_EXTREMES_SUM,
+])
+def test_incremental_errors_match_recomputation(extreme_preservation):
+    rng = np.random.default_rng(3)
+    t = np.arange(240)
+    values = np.column_stack([np.sin(t / 24 * 2 * np.pi), rng.random(240)]) + rng.random((240, 2))
+    config = ClusteringConfig(n_prime=12, calc_stats=True, extreme_preservation=extreme_preservation)
+    modes = [ProfileType.DEMAND, ProfileType.SOLAR]
+
+    _, _, _, ward_errors, ldc_errors = hierarchical_time_clustering_ward(values, modes, config)
+    expected_ward, expected_ldc = recomputed_errors(ward_merge_log(values, modes, config, config.n_prime))
+
+    assert ward_errors.shape == expected_ward.shape == (240 - 12, 2)
+    np.testing.assert_allclose(ward_errors, expected_ward, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(ldc_errors, expected_ldc, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from cluster.propagation import endpoint_flow_partitions, propagate_partitions
+
+KEYS = ("rep_period",)
+
+
+def results_frame(partitions: dict) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"asset": list(partitions), "rep_period": "1", "partition": list(partitions.values())}
+    )
+
+
+def flows_frame(pairs) -> pd.DataFrame:
+    return pd.DataFrame(pairs, columns=["from_asset", "to_asset"]).assign(rep_period="1")
+
+
+def test_endpoint_flow_partitions_first_match():
+    # Unequal lengths: 6, 4 and 3 steps.
+    results = results_frame({"NL_demand": "2;4", "NL_solar": "1;3", "BE_demand": "3"})
+    flows = flows_frame([
+        ("NL_solar", "NL_demand"),
+        ("NL_battery", "NL_demand"),
+        ("NL_battery", "NL_storage"),
+        ("BE_demand", "NL_demand"),
+        ("NL_solar", "NL_demand"),
+    ])
+    out = endpoint_flow_partitions(results, flows, period_keys=KEYS)
+
+    expected = flows_frame([
+        ("NL_solar", "NL_demand"),
+        ("NL_battery", "NL_demand"),
+        ("BE_demand", "NL_demand"),
+        ("NL_solar", "NL_demand"),
+    ]).assign(specification="explicit", partition=["1;3", "2;4", "3", "1;3"])
+    pd.testing.assert_frame_equal(out.reset_index(drop=True), expected)
+
+
+def test_endpoint_flow_partitions_matches_lookup_loop():
+    rng = np.random.default_rng(0)
+    assets = [f"{loc}_{kind}" for loc in ("NL", "BE", "DE") for kind in ("demand", "solar", "wind")]
+    profiled = {a: ";".join(map(str, rng.integers(1, 5, rng.integers(1, 6)))) for a in assets[::2]}
+    pairs = [tuple(rng.choice(assets, 2)) for _ in range(50)]
+
+    mapping = dict(profiled)
+    expected = [
+        [f, t, mapping.get(f) or mapping.get(t)] for f, t in pairs if mapping.get(f) or mapping.get(t)
+    ]
+    out = endpoint_flow_partitions(results_frame(profiled), flows_frame(pairs), period_keys=KEYS)
+    assert out[["from_asset", "to_asset", "partition"]].values.tolist() == expected
+
+
+def test_propagate_partitions_unequal_lengths():
+    results = results_frame({
+        "NL_demand": "2;2;2", "NL_solar": "3;3",   # 6 steps
+        "NL_wind": "1;3",                          # 4 steps
+        "BE_demand": "1;2",                        # 3 steps
+    })
+    flows = flows_frame([
+        ("NL_solar", "NL_demand"),    # same length: common resolution
+        ("NL_wind", "NL_demand"),     # mixed lengths: from_asset
+        ("NL_battery", "BE_demand"),  # one profiled endpoint
+        ("NL_battery", "NL_storage"), # location common of the first length group
+    ])
+    assets = pd.DataFrame({"asset": ["NL_storage", "BE_ENS"], "rep_period": "1"})
+    asset_updates, flow_updates = propagate_partitions(results, assets, flows, period_keys=KEYS)
+
+    flow_partitions = flow_updates.set_index(["from_asset", "to_asset"])["partition"]
+    assert flow_partitions[("NL_solar", "NL_demand")] == "2;1;1;2"
+    assert flow_partitions[("NL_wind", "NL_demand")] == "1;3"
+    assert flow_partitions[("NL_battery", "BE_demand")] == "1;2"
+    assert flow_partitions[("NL_battery", "NL_storage")] == "1;3"
+    assert len(flow_updates) == len(flows)
+    assert asset_updates.set_index("asset")["partition"].to_dict() == {"NL_storage": "1;3", "BE_ENS": "1;2"}
+
+
+def test_generate_clusters_unequal_profile_lengths(tmp_path, monkeypatch):
+    import generate_clusters
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(generate_clusters, "NUM_WORKERS", 1)
+    (tmp_path / "Cases/1h").mkdir(parents=True)
+    rng = np.random.default_rng(0)
+
+    def write(name, profiles):
+        rows = [(p, t + 1, v) for p, values in profiles.items() for t, v in enumerate(values)]
+        with open(tmp_path / "Cases/1h" / name, "w") as f:
+            f.write(",,\n")
+            pd.DataFrame(rows, columns=["profile_name", "time_step", "value"]).to_csv(f, index=False)
+
+    write("profiles-rep-periods-demand.csv", {"NL_demand": rng.random(2000)})
+    write("profiles-rep-periods-availability.csv", {"NL_solar": rng.random(1500)})
+    write("profiles-rep-periods-inflows.csv", {"NO_inflow": rng.random(1000)})
+    with open(tmp_path / "Cases/1h/flows-data.csv", "w") as f:
+        f.write(",,,\n")
+        pd.DataFrame({
+            "id": [1, 2, 3],
+            "from_asset": ["NL_solar", "NO_hydro", "NL_battery"],
+            "to_asset": ["NL_demand", "NO_inflow", "NL_storage"],
+        }).to_csv(f, index=False)
+
+    generate_clusters.main()
+
+    assets = pd.read_csv(generate_clusters.ASSETS_OUTPUT_FILE, header=1).set_index("asset")["partition"]
+    flows = pd.read_csv(generate_clusters.FLOWS_OUTPUT_FILE, header=1)
+    assert flows[["from_asset", "to_asset"]].values.tolist() == [["NL_solar", "NL_demand"], ["NO_hydro", "NO_inflow"]]
+    assert flows["partition"].tolist() == [assets["NL_solar"], assets["NO_inflow"]]
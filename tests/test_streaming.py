@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from cluster import ClusteringConfig, ProfileType, hierarchical_time_clustering_ward
+from cluster.streaming import iter_windows, stream_time_clustering_ward, streamed_time_clustering_ward
+
+T = 8760
+MODES = [ProfileType.DEMAND, ProfileType.SOLAR]
+
+
+@pytest.fixture(scope="module")
+def values():
+    rng = np.random.default_rng(0)
+    daily = np.abs(np.sin(np.arange(T) / 24 * 2 * np.pi))[:, None]
+    return daily + 0.3 * rng.random((T, 2))
+
+
+@pytest.mark.parametrize("overlap", [0, 168])
+@pytest.mark.parametrize("window", [200, 744])
+@pytest.mark.parametrize("n_prime", [1, 7, 10, 100])
+def test_exact_block_count(values, n_prime, window, overlap):
+    config = ClusteringConfig(n_prime=n_prime)
+    partitions, _, mean_values = streamed_time_clustering_ward(
+        iter_windows(values, window), MODES, T, config, overlap=overlap
+    )
+    assert len(partitions) == n_prime
+    assert partitions.sum() == T
+    assert (partitions > 0).all()
+    starts = np.concatenate([[0], np.cumsum(partitions)[:-1]])
+    assert np.allclose(np.add.reduceat(values, starts, axis=0) / partitions[:, None], mean_values)
+
+
+def test_single_window_matches_one_shot(values):
+    config = ClusteringConfig(n_prime=50)
+    expected, _, _, _, _ = hierarchical_time_clustering_ward(values, MODES, config)
+    partitions, _, _ = streamed_time_clustering_ward(iter_windows(values, T), MODES, T, config)
+    assert (partitions == expected).all()
+
+
+def test_tail_stays_bounded(values):
+    config = ClusteringConfig(n_prime=10)
+    window, max_tail = 200, 400
+    delivered = 0
+
+    def windows():
+        nonlocal delivered
+        for w in iter_windows(values, window):
+            delivered += len(w)
+            yield w
+
+    done = 0
+    for partitions, _, _ in stream_time_clustering_ward(windows(), MODES, T, config, overlap=168, max_tail=max_tail):
+        done += partitions.sum()
+        assert delivered - done <= max_tail
+    assert done == T
+
+
+@pytest.mark.parametrize("length", [T - 1, T + 1])
+def test_length_mismatch(values, length):
+    with pytest.raises(ValueError):
+        streamed_time_clustering_ward(iter_windows(values, 744), MODES, length, ClusteringConfig(n_prime=10))